@@ -68,6 +68,13 @@ if [ -f "requirements.txt" ] && command -v pip &> /dev/null; then
     echo "✅ 依赖安装完成"
 fi
 
+# 预编译字节码，首次启动服务器时无需再编译源码
+if [ -d "src" ] && command -v python3 &> /dev/null; then
+    echo "⚙️ 预编译Python字节码..."
+    python3 -m compileall -q src
+    echo "✅ 字节码预编译完成"
+fi
+
 echo ""
 echo "🎉 安装完成！"
 echo ""
@@ -635,6 +635,25 @@ class CookieManager:
         except Exception as e:
             raise AuthenticationError(f"加载cookies失败: {str(e)}", auth_type="cookie_load") from e
     
+    def count_cookies(self) -> int:
+        """
+        统计cookies文件中的cookie数量，不解析JSON
+        
+        只用于启动日志和"是否已登录"这类存在性判断；需要cookie内容时请使用load_cookies。
+        每个cookie对象恰好包含一个"name"键，值中的引号在JSON里会被转义，
+        因此直接在原始字节中计数即可，新旧两种文件格式都适用
+        
+        Returns:
+            int: cookie数量，文件不存在或为空时返回0
+        """
+        cookies_file = Path(self.config.cookies_file)
+        try:
+            if cookies_file.stat().st_size == 0:
+                return 0
+            return cookies_file.read_bytes().count(b'"name":')
+        except OSError:
+            return 0
+    
     def display_cookies_info(self) -> None:
         """显示当前cookies信息"""
         cookies_file = Path(self.config.cookies_file)
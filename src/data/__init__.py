@@ -5,7 +5,6 @@
 """
 
 from .storage.csv_storage import CSVStorage
-from .storage.pg_storage import PostgreSQLStorage
 from .storage.base import BaseStorage
 from .storage_manager import storage_manager
 from .scheduler import data_scheduler
@@ -16,4 +15,12 @@ __all__ = [
     'BaseStorage',
     'storage_manager',
     'data_scheduler'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # PostgreSQL存储默认未启用，访问时才导入
+    if name == 'PostgreSQLStorage':
+        from .storage.pg_storage import PostgreSQLStorage
+        return PostgreSQLStorage
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -5,26 +5,107 @@
 """
 
 import os
+import time
 import asyncio
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
+from typing import Optional, Dict, Any, List, Union
+from datetime import datetime, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from dataclasses import dataclass, asdict, field
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.executors.asyncio import AsyncIOExecutor
 
 from .storage_manager import storage_manager
+from ..core.exceptions import ConfigurationError
 
 logger = logging.getLogger(__name__)
 
 
+def _env_bool(name: str, default: bool = True) -> bool:
+    """读取布尔型环境变量，未设置时返回默认值；只有true（不区分大小写）视为开启"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() == 'true'
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerConfig:
+    """调度器配置（进程生命周期内只从环境变量读取一次）"""
+    enable_auto_collection: bool
+    run_on_startup: bool
+    collection_schedule: str
+    timezone: str
+    collect_dashboard: bool
+    collect_content_analysis: bool
+    collect_fans: bool
+    misfire_grace_time: int
+
+
+@dataclass(slots=True)
+class JobInfoCache:
+    """get_job_info 中不随轮询变化的部分"""
+    config: Dict[str, Any]
+    job_templates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
 class DataCollectionScheduler:
     """数据采集调度器"""
     
     def __init__(self):
         self.scheduler: Optional[AsyncIOScheduler] = None
         self.client = None
+        self.config: Optional[SchedulerConfig] = None
+        self._trigger: Optional[CronTrigger] = None
+        self._tz: Union[tzinfo, str, None] = None
+        self._job_info_cache: Optional[JobInfoCache] = None
         self._running = False
+        # cookies文件缓存（按mtime判断是否需要重新加载）
+        self._cookies_path: Optional[str] = None
+        self._cookies_mtime = 0.0
+        self._cookies: List[Dict[str, Any]] = []
+        
+    def _load_config(self) -> SchedulerConfig:
+        """从环境变量加载调度器配置"""
+        return SchedulerConfig(
+            enable_auto_collection=_env_bool('ENABLE_AUTO_COLLECTION', True),
+            run_on_startup=_env_bool('RUN_ON_STARTUP', True),
+            collection_schedule=os.getenv('COLLECTION_SCHEDULE', '0 1 * * *'),
+            timezone=os.getenv('TIMEZONE', 'Asia/Shanghai'),
+            collect_dashboard=_env_bool('COLLECT_DASHBOARD', True),
+            collect_content_analysis=_env_bool('COLLECT_CONTENT_ANALYSIS', True),
+            collect_fans=_env_bool('COLLECT_FANS', True),
+            misfire_grace_time=self._parse_misfire_grace_time(os.getenv('MISFIRE_GRACE_TIME', '300'))
+        )
+        
+    @staticmethod
+    def _parse_misfire_grace_time(value: str) -> int:
+        """
+        解析错过触发后仍允许执行的宽限时间
+        
+        Args:
+            value: 环境变量MISFIRE_GRACE_TIME的值（秒）
+            
+        Returns:
+            int: 宽限时间（秒）
+            
+        Raises:
+            ConfigurationError: 不是正整数时
+        """
+        try:
+            seconds = int(value)
+        except ValueError as e:
+            raise ConfigurationError(
+                f"无效的错过触发宽限时间 MISFIRE_GRACE_TIME='{value}': 需要正整数秒数",
+                config_item="MISFIRE_GRACE_TIME"
+            ) from e
+        if seconds <= 0:
+            raise ConfigurationError(
+                f"无效的错过触发宽限时间 MISFIRE_GRACE_TIME='{value}': 需要正整数秒数",
+                config_item="MISFIRE_GRACE_TIME"
+            )
+        return seconds
         
     def initialize(self, client) -> None:
         """
@@ -32,28 +113,53 @@ class DataCollectionScheduler:
         
         Args:
             client: 小红书客户端实例
+            
+        Raises:
+            ConfigurationError: 采集计划（cron表达式）或MISFIRE_GRACE_TIME格式无效时
         """
         self.client = client
+        self._cookies_path = client.config.cookies_file
+        
+        # 一次性读取环境变量配置
+        self.config = self._load_config()
+        self._job_info_cache = JobInfoCache(config=asdict(self.config))
+        
+        # 解析一次时区，调度器和触发器共用同一个tzinfo对象
+        try:
+            self._tz = ZoneInfo(self.config.timezone)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            logger.warning(f"加载时区失败，交由APScheduler解析: {e}")
+            self._tz = self.config.timezone
+        
+        # 预先解析cron表达式，格式无效时在启动前直接报错，避免调度器空转
+        try:
+            self._trigger = self._build_trigger(self.config.collection_schedule)
+        except ValueError as e:
+            raise ConfigurationError(
+                f"无效的数据采集计划 COLLECTION_SCHEDULE='{self.config.collection_schedule}': {e}",
+                config_item="COLLECTION_SCHEDULE"
+            ) from e
         
         # 创建调度器
+        # 采集任务都是协程，直接在服务器的事件循环中执行，不再额外创建线程池
         executors = {
             'default': AsyncIOExecutor()
         }
         
+        # 合并错过的触发、禁止任务堆积，事件循环短暂繁忙时允许延迟执行
         job_defaults = {
-            'coalesce': False,
-            'max_instances': 1
+            'coalesce': True,
+            'max_instances': 1,
+            'misfire_grace_time': self.config.misfire_grace_time
         }
         
-        timezone = os.getenv('TIMEZONE', 'Asia/Shanghai')
-        
         self.scheduler = AsyncIOScheduler(
             executors=executors,
             job_defaults=job_defaults,
-            timezone=timezone
+            timezone=self._tz
         )
         
-        logger.info(f"数据采集调度器已初始化，时区: {timezone}")
+        logger.info(f"数据采集调度器已初始化，时区: {self.config.timezone}")
         
     async def start(self) -> None:
         """启动调度器"""
@@ -66,9 +172,7 @@ class DataCollectionScheduler:
             return
             
         # 检查是否启用自动采集
-        enable_auto_collection = os.getenv('ENABLE_AUTO_COLLECTION', 'true').lower() == 'true'
-        
-        if not enable_auto_collection:
+        if not self.config.enable_auto_collection:
             logger.info("自动数据采集已禁用")
             return
             
@@ -81,51 +185,77 @@ class DataCollectionScheduler:
         self._add_scheduled_jobs()
         
         # 检查是否需要在启动时立即执行一次采集
-        run_on_startup = os.getenv('RUN_ON_STARTUP', 'true').lower() == 'true'
-        
-        if run_on_startup:
+        if self.config.run_on_startup:
             logger.info("程序启动时执行数据采集...")
             await self._run_data_collection()
             
-    def _add_scheduled_jobs(self) -> None:
-        """添加定时任务"""
-        # 获取cron表达式
-        cron_schedule = os.getenv('COLLECTION_SCHEDULE', '0 1 * * *')
+    def _load_cookies_cached(self) -> List[Dict[str, Any]]:
+        """
+        加载cookies，文件未变化时直接复用上次的结果
         
+        Returns:
+            Cookie列表
+        """
         try:
-            # 解析cron表达式
-            cron_parts = cron_schedule.split()
+            mtime = os.stat(self._cookies_path).st_mtime
+        except OSError:
+            self._cookies_mtime = 0.0
+            self._cookies = []
+            return self._cookies
             
-            if len(cron_parts) == 5:
-                # 标准cron格式：分 时 日 月 星期
-                minute, hour, day, month, day_of_week = cron_parts
-                second = '0'
-            elif len(cron_parts) == 6:
-                # 扩展cron格式：秒 分 时 日 月 星期
-                second, minute, hour, day, month, day_of_week = cron_parts
-            else:
-                raise ValueError(f"无效的cron表达式格式: {cron_schedule}")
-                
-            # 创建cron触发器
-            trigger = CronTrigger(
-                second=second,
-                minute=minute,
-                hour=hour,
-                day=day,
-                month=month,
-                day_of_week=day_of_week
-            )
+        if mtime != self._cookies_mtime:
+            self._cookies = self.client.cookie_manager.load_cookies()
+            self._cookies_mtime = mtime
+            logger.debug(f"🍪 重新读取cookies文件: {self._cookies_path}")
+        return self._cookies
+        
+    def _build_trigger(self, cron_schedule: str) -> CronTrigger:
+        """
+        解析cron表达式并创建触发器
+        
+        Args:
+            cron_schedule: cron表达式，支持5段（分 时 日 月 星期）或6段（秒 分 时 日 月 星期）
+            
+        Returns:
+            CronTrigger: cron触发器
             
-            # 添加定时任务
+        Raises:
+            ValueError: cron表达式格式无效时
+        """
+        cron_parts = cron_schedule.split()
+        
+        if len(cron_parts) == 5:
+            # 标准cron格式：分 时 日 月 星期
+            minute, hour, day, month, day_of_week = cron_parts
+            second = '0'
+        elif len(cron_parts) == 6:
+            # 扩展cron格式：秒 分 时 日 月 星期
+            second, minute, hour, day, month, day_of_week = cron_parts
+        else:
+            raise ValueError(f"无效的cron表达式格式: {cron_schedule}")
+            
+        return CronTrigger(
+            second=second,
+            minute=minute,
+            hour=hour,
+            day=day,
+            month=month,
+            day_of_week=day_of_week,
+            timezone=self._tz
+        )
+        
+    def _add_scheduled_jobs(self) -> None:
+        """添加定时任务"""
+        try:
             self.scheduler.add_job(
                 func=self._run_data_collection,
-                trigger=trigger,
+                trigger=self._trigger,
                 id='data_collection_job',
                 name='数据采集任务',
-                replace_existing=True
+                replace_existing=True,
+                misfire_grace_time=self.config.misfire_grace_time
             )
-            
-            logger.info(f"定时数据采集任务已添加，计划: {cron_schedule}")
+            logger.info(f"定时数据采集任务已添加，计划: {self.config.collection_schedule}")
             
         except Exception as e:
             logger.error(f"添加定时任务失败: {e}")
@@ -136,13 +266,19 @@ class DataCollectionScheduler:
             logger.error("客户端未初始化，无法执行数据采集")
             return
             
-        logger.info("开始执行数据采集任务...")
-        start_time = datetime.now()
-        
         # 获取采集配置
-        collect_dashboard = os.getenv('COLLECT_DASHBOARD', 'true').lower() == 'true'
-        collect_content = os.getenv('COLLECT_CONTENT_ANALYSIS', 'true').lower() == 'true'
-        collect_fans = os.getenv('COLLECT_FANS', 'true').lower() == 'true'
+        collect_dashboard = self.config.collect_dashboard
+        collect_content = self.config.collect_content_analysis
+        collect_fans = self.config.collect_fans
+        
+        # 所有采集项都被禁用时，无需启动浏览器
+        if not (collect_dashboard or collect_content or collect_fans):
+            logger.info("所有采集任务已禁用，跳过本次数据采集")
+            return
+            
+        logger.info("开始执行数据采集任务...")
+        start_time = time.time()
+        start_monotonic = time.monotonic()
         
         success_count = 0
         total_count = 0
@@ -171,64 +307,45 @@ class DataCollectionScheduler:
         try:
             driver = self.client.browser_manager.create_driver()
             
-            # 加载cookies
-            cookies = self.client.cookie_manager.load_cookies()
-            if cookies:
+            # 每次采集都会新建浏览器，cookies需要重新注入；文件未变化时复用已解析的结果
+            cookies = self._load_cookies_cached()
+            if not cookies:
+                logger.warning("⚠️ 未找到cookies，数据采集可能失败")
+            else:
                 # 先访问小红书主页以设置域名
                 driver.get("https://www.xiaohongshu.com")
                 
                 # 加载cookies
                 cookie_result = self.client.browser_manager.load_cookies(cookies)
                 logger.info(f"🍪 Cookies加载结果: {cookie_result}")
-            else:
-                logger.warning("⚠️ 未找到cookies，数据采集可能失败")
         
         except Exception as e:
             logger.error(f"❌ 创建WebDriver失败: {e}")
             return
         
+        collectors = []
+        if collect_dashboard:
+            collectors.append(('仪表板', collect_dashboard_data))
+        if collect_content:
+            collectors.append(('内容分析', collect_content_analysis_data))
+        if collect_fans:
+            collectors.append(('粉丝', collect_fans_data))
+        total_count = len(collectors)
+        
         try:
-            # 采集仪表板数据
-            if collect_dashboard:
-                total_count += 1
+            # 所有采集器共用同一个WebDriver，按固定顺序依次执行
+            for name, collect_func in collectors:
+                logger.info(f"采集{name}数据...")
                 try:
-                    logger.info("采集仪表板数据...")
-                    result = collect_dashboard_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 仪表板数据采集完成")
-                    else:
-                        logger.error(f"❌ 仪表板数据采集失败: {result.get('error', '未知错误')}")
+                    result = await collect_func(driver, save_data=True)
                 except Exception as e:
-                    logger.error(f"❌ 仪表板数据采集失败: {e}")
+                    result = {'success': False, 'error': str(e)}
                     
-            # 采集内容分析数据
-            if collect_content:
-                total_count += 1
-                try:
-                    logger.info("采集内容分析数据...")
-                    result = await collect_content_analysis_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 内容分析数据采集完成")
-                    else:
-                        logger.error(f"❌ 内容分析数据采集失败: {result.get('error', '未知错误')}")
-                except Exception as e:
-                    logger.error(f"❌ 内容分析数据采集失败: {e}")
-                    
-            # 采集粉丝数据
-            if collect_fans:
-                total_count += 1
-                try:
-                    logger.info("采集粉丝数据...")
-                    result = collect_fans_data(driver, save_data=True)
-                    if result.get("success", False):
-                        success_count += 1
-                        logger.info("✅ 粉丝数据采集完成")
-                    else:
-                        logger.error(f"❌ 粉丝数据采集失败: {result.get('error', '未知错误')}")
-                except Exception as e:
-                    logger.error(f"❌ 粉丝数据采集失败: {e}")
+                if result.get("success", False):
+                    success_count += 1
+                    logger.info(f"✅ {name}数据采集完成")
+                else:
+                    logger.error(f"❌ {name}数据采集失败: {result.get('error', '未知错误')}")
                     
         finally:
             # 确保关闭WebDriver
@@ -240,14 +357,16 @@ class DataCollectionScheduler:
                     logger.warning(f"⚠️ 关闭WebDriver时出错: {e}")
                 
         # 记录采集结果
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_monotonic
         
-        logger.info(f"数据采集任务完成，成功: {success_count}/{total_count}，耗时: {duration:.2f}秒")
+        logger.info("数据采集任务完成，成功: %d/%d，耗时: %.2f秒", success_count, total_count, duration)
         
-        # 保存采集日志到存储
+        # 采集日志目前只输出到DEBUG日志，未启用DEBUG时不必构建
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+            
         collection_log = {
-            'timestamp': start_time.isoformat(),
+            'timestamp': datetime.fromtimestamp(start_time).isoformat(),
             'duration_seconds': duration,
             'total_tasks': total_count,
             'successful_tasks': success_count,
@@ -261,7 +380,7 @@ class DataCollectionScheduler:
         
         try:
             # 这里可以将采集日志保存到单独的日志表或文件
-            logger.debug(f"采集日志: {collection_log}")
+            logger.debug("采集日志: %s", collection_log)
         except Exception as e:
             logger.error(f"保存采集日志失败: {e}")
             
@@ -270,6 +389,8 @@ class DataCollectionScheduler:
         if self.scheduler and self._running:
             self.scheduler.shutdown(wait=True)
             self._running = False
+            # 写入缓冲中尚未落盘的采集数据（文件写入放到线程中执行，避免阻塞事件循环）
+            await asyncio.to_thread(storage_manager.flush)
             logger.info("数据采集调度器已停止")
             
     def is_running(self) -> bool:
@@ -281,27 +402,26 @@ class DataCollectionScheduler:
         if not self.scheduler:
             return {'status': 'not_initialized'}
             
+        cache = self._job_info_cache
         jobs = []
         for job in self.scheduler.get_jobs():
+            # id/name/trigger在任务生命周期内不变，只有下次执行时间需要每次计算
+            template = cache.job_templates.get(job.id)
+            if template is None:
+                template = cache.job_templates[job.id] = {
+                    'id': job.id,
+                    'name': job.name,
+                    'trigger': str(job.trigger)
+                }
             jobs.append({
-                'id': job.id,
-                'name': job.name,
-                'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None,
-                'trigger': str(job.trigger)
+                **template,
+                'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None
             })
             
         return {
             'status': 'running' if self._running else 'stopped',
             'jobs': jobs,
-            'config': {
-                'enable_auto_collection': os.getenv('ENABLE_AUTO_COLLECTION', 'true'),
-                'run_on_startup': os.getenv('RUN_ON_STARTUP', 'true'),
-                'collection_schedule': os.getenv('COLLECTION_SCHEDULE', '0 1 * * *'),
-                'timezone': os.getenv('TIMEZONE', 'Asia/Shanghai'),
-                'collect_dashboard': os.getenv('COLLECT_DASHBOARD', 'true'),
-                'collect_content_analysis': os.getenv('COLLECT_CONTENT_ANALYSIS', 'true'),
-                'collect_fans': os.getenv('COLLECT_FANS', 'true')
-            }
+            'config': cache.config
         }
         
     async def run_manual_collection(self) -> Dict[str, Any]:
@@ -6,10 +6,17 @@
 
 from .base import BaseStorage
 from .csv_storage import CSVStorage
-from .pg_storage import PostgreSQLStorage
 
 __all__ = [
     'BaseStorage',
     'CSVStorage',
     'PostgreSQLStorage'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # PostgreSQL存储默认未启用，访问时才导入
+    if name == 'PostgreSQLStorage':
+        from .pg_storage import PostgreSQLStorage
+        return PostgreSQLStorage
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
@@ -4,9 +4,35 @@
 定义数据存储的通用接口
 """
 
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Iterable
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+@lru_cache(maxsize=1)
+def _get_timezone() -> Optional[tzinfo]:
+    """
+    获取缓存的时区对象
+    
+    首次使用时才读取TIMEZONE，保证.env已经加载；系统缺少时区数据时退回本地时间
+    """
+    try:
+        return ZoneInfo(os.getenv('TIMEZONE', 'Asia/Shanghai'))
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _now_iso() -> str:
+    """生成精确到秒、带时区偏移的ISO时间字符串"""
+    return datetime.now(_get_timezone()).isoformat(timespec='seconds')
+
+
+def _today_str() -> str:
+    """生成与_now_iso日期部分一致的当天日期字符串 (YYYY-MM-DD)"""
+    return datetime.now(_get_timezone()).strftime('%Y-%m-%d')
 
 
 class BaseStorage(ABC):
@@ -46,12 +72,12 @@ class BaseStorage(ABC):
         pass
     
     @abstractmethod
-    async def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> bool:
+    async def save_content_analysis_data(self, data: Iterable[Dict[str, Any]]) -> bool:
         """
         保存内容分析数据
         
         Args:
-            data: 内容分析数据列表
+            data: 内容分析数据，可以是列表或逐条产出的可迭代对象
             
         Returns:
             bool: 保存是否成功
@@ -90,25 +116,26 @@ class BaseStorage(ABC):
         """关闭存储连接"""
         pass
     
-    def _add_timestamp(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _add_timestamp(self, data: Dict[str, Any], ts: Optional[str] = None) -> Dict[str, Any]:
         """
         为数据添加时间戳
         
         Args:
             data: 原始数据
+            ts: 共享的时间戳字符串，批量处理时由调用方传入，默认取当前时间
             
         Returns:
             Dict[str, Any]: 添加时间戳后的数据
         """
-        if isinstance(data, dict):
-            data = data.copy()
-            data['created_at'] = datetime.now().isoformat()
-            data['updated_at'] = datetime.now().isoformat()
-        return data
+        if not isinstance(data, dict):
+            return data
+        if ts is None:
+            ts = _now_iso()
+        return {**data, 'created_at': ts, 'updated_at': ts}
     
     def _add_timestamps_to_list(self, data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        为数据列表中的每个项目添加时间戳
+        为数据列表中的每个项目添加时间戳（同一批次共享一个时间戳）
         
         Args:
             data_list: 数据列表
@@ -116,4 +143,5 @@ class BaseStorage(ABC):
         Returns:
             List[Dict[str, Any]]: 添加时间戳后的数据列表
         """
-        return [self._add_timestamp(item) for item in data_list] 
\ No newline at end of file
+        ts = _now_iso()
+        return [self._add_timestamp(item, ts) for item in data_list]
@@ -4,18 +4,39 @@ CSV存储实现
 提供基于CSV文件的数据存储功能
 """
 
+import io
+import os
 import csv
+import atexit
 import json
+import heapq
+import weakref
 import logging
-import pandas as pd
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Tuple
 
-from .base import BaseStorage
+from .base import BaseStorage, _now_iso, _today_str
 
 logger = logging.getLogger(__name__)
 
+# 写文件时使用的缓冲区大小，整批数据尽量一次系统调用落盘
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# 从文件末尾查找今日数据时每次读取的块大小
+_TAIL_READ_SIZE = 64 * 1024
+
+# 开启了内存缓冲的存储实例（弱引用，不阻止实例被回收），进程退出时统一落盘
+_BUFFERED_STORAGES: 'weakref.WeakSet[CSVStorage]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_storages() -> None:
+    """进程正常退出时写入所有缓冲中尚未落盘的数据"""
+    for storage in list(_BUFFERED_STORAGES):
+        storage.flush()
+
 
 class CSVStorage(BaseStorage):
     """CSV存储实现类"""
@@ -109,11 +130,64 @@ class CSVStorage(BaseStorage):
         self.content_analysis_chinese_headers = [self.field_chinese_mapping[field] for field in self.content_analysis_fields]
         self.fans_chinese_headers = [self.field_chinese_mapping[field] for field in self.fans_fields]
         
+        # 预先编码好的表头行，创建文件和校验表头时直接使用
+        self._dashboard_header = (','.join(self.dashboard_chinese_headers) + '\n').encode('utf-8')
+        self._content_analysis_header = (','.join(self.content_analysis_chinese_headers) + '\n').encode('utf-8')
+        self._fans_header = (','.join(self.fans_chinese_headers) + '\n').encode('utf-8')
+        self._header_lines = {
+            self.dashboard_file: self._dashboard_header,
+            self.content_analysis_file: self._content_analysis_header,
+            self.fans_file: self._fans_header
+        }
+        
+        # 预编译的行格式模板，按字段位置填充元组行
+        self._dashboard_row_fmt = ','.join(['{}'] * len(self.dashboard_fields)) + '\n'
+        self._content_analysis_row_fmt = ','.join(['{}'] * len(self.content_analysis_fields)) + '\n'
+        self._fans_row_fmt = ','.join(['{}'] * len(self.fans_fields)) + '\n'
+        self._row_formats = {
+            self.dashboard_file: self._dashboard_row_fmt,
+            self.content_analysis_file: self._content_analysis_row_fmt,
+            self.fans_file: self._fans_row_fmt
+        }
+        
+        # 各文件是否需要CSV转义：仪表板和粉丝数据只有ISO时间、维度和整数，不可能出现逗号或引号，
+        # 内容分析的笔记标题等文本字段则可能包含
+        self._needs_quoting = {
+            self.dashboard_file: False,
+            self.content_analysis_file: True,
+            self.fans_file: False
+        }
+        
+        # 各数据类型的字段缺省值，与字段列表中 created_at/updated_at 之后的字段一一对应
+        self.dashboard_defaults = ('', '') + (0,) * 6
+        self.content_analysis_defaults = (
+            ('', '', '', '')          # timestamp, title, note_type, publish_time
+            + (0,) * 6                # views ~ fans_growth
+            + ('', 0)                 # avg_watch_time, danmu_count
+            + ('0%',) * 10            # 观众来源、性别、年龄占比
+            + ('',) * 6               # 城市、兴趣TOP3
+        )
+        self.fans_defaults = ('', '') + (0,) * 3
+        
+        # 预先配对 (字段名, 缺省值)，保存时按字段顺序直接生成元组行
+        self._dashboard_columns = tuple(zip(self.dashboard_fields[2:], self.dashboard_defaults))
+        self._ca_columns = tuple(zip(self.content_analysis_fields[2:], self.content_analysis_defaults))
+        self._fans_columns = tuple(zip(self.fans_fields[2:], self.fans_defaults))
+        
+        # 今日数据的内存缓冲（可选）：短时间内多次保存同一文件时只落盘最后一次
+        # 默认 flush_interval=0，每次保存直接写文件；开启后进程崩溃时会丢失尚未落盘的数据
+        self.flush_interval = float(config.get('flush_interval', 0))
+        self._buffer: Dict[Path, Tuple[List[str], List[tuple], Optional[List[str]], str]] = {}
+        self._buffer_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        if self.flush_interval > 0:
+            _BUFFERED_STORAGES.add(self)
+        
         # 自动初始化
         self._initialize_sync()
     
     def _initialize_sync(self) -> None:
-        """同步初始化CSV存储"""
+        """同步初始化CSV存储（可重复调用，已存在的目录和文件不会被改动）"""
         try:
             # 创建数据目录
             self.csv_dir.mkdir(parents=True, exist_ok=True)
@@ -154,16 +228,17 @@ class CSVStorage(BaseStorage):
             fields: 英文字段列表（用于代码逻辑）
             chinese_headers: 中文表头列表（用于CSV显示）
         """
-        if not file_path.exists():
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                if chinese_headers:
-                    # 使用中文表头
-                    f.write(','.join(chinese_headers) + '\n')
-                else:
-                    # 降级到英文表头
-                    writer = csv.DictWriter(f, fieldnames=fields)
-                    writer.writeheader()
-            logger.debug(f"📄 创建CSV文件: {file_path}")
+        # O_EXCL 让存在性检查与创建成为一次原子操作，文件已存在时直接跳过
+        try:
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        try:
+            os.write(fd, self._get_header_line(file_path, fields, chinese_headers))
+        finally:
+            os.close(fd)
+        self._write_meta(file_path, 0)
+        logger.debug(f"📄 创建CSV文件: {file_path}")
     
     def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
         """
@@ -173,85 +248,33 @@ class CSVStorage(BaseStorage):
             data: 仪表板数据列表
         """
         try:
-            if not self._initialized:
-                self._initialize_sync()
-            
-            # 处理数据格式
-            rows = []
-            for item in data:
-                row = self._add_timestamp({
-                    'timestamp': item.get('timestamp', ''),
-                    'dimension': item.get('dimension', ''),
-                    'views': item.get('views', 0),
-                    'likes': item.get('likes', 0),
-                    'collects': item.get('collects', 0),
-                    'comments': item.get('comments', 0),
-                    'shares': item.get('shares', 0),
-                    'interactions': item.get('interactions', 0)
-                })
-                rows.append(row)
-            
-            # 按日期覆盖保存
-            self._save_with_daily_overwrite(self.dashboard_file, self.dashboard_fields, rows, self.dashboard_chinese_headers)
-            
-            logger.info(f"💾 仪表板数据已保存到CSV: {len(rows)} 条记录")
+            assert self._initialized, "CSV存储未初始化"
+            
+            # 处理数据格式，同一批次共享一个时间戳
+            rows = self._build_rows(data, self._dashboard_columns, _now_iso())
+            
+            # 按日期覆盖保存（经内存缓冲合并后落盘）
+            self._store_today_rows(self.dashboard_file, self.dashboard_fields, rows, self.dashboard_chinese_headers, label='仪表板')
             
         except Exception as e:
             logger.error(f"❌ 保存仪表板数据失败: {e}")
             raise
     
-    def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
+    def save_content_analysis_data(self, data: Iterable[Dict[str, Any]]) -> None:
         """
         同步保存内容分析数据到CSV
         
         Args:
-            data: 内容分析数据列表
+            data: 内容分析数据，可以是列表或逐条产出的可迭代对象
         """
         try:
-            if not self._initialized:
-                self._initialize_sync()
-            
-            # 处理数据格式
-            rows = []
-            for item in data:
-                row = self._add_timestamp({
-                    'timestamp': item.get('timestamp', ''),
-                    'title': item.get('title', ''),
-                    'note_type': item.get('note_type', ''),
-                    'publish_time': item.get('publish_time', ''),
-                    'views': item.get('views', 0),
-                    'likes': item.get('likes', 0),
-                    'comments': item.get('comments', 0),
-                    'collects': item.get('collects', 0),
-                    'shares': item.get('shares', 0),
-                    'fans_growth': item.get('fans_growth', 0),
-                    'avg_watch_time': item.get('avg_watch_time', ''),
-                    'danmu_count': item.get('danmu_count', 0),
-                    # 观众来源数据
-                    'source_recommend': item.get('source_recommend', '0%'),
-                    'source_search': item.get('source_search', '0%'),
-                    'source_follow': item.get('source_follow', '0%'),
-                    'source_other': item.get('source_other', '0%'),
-                    # 观众分析数据
-                    'gender_male': item.get('gender_male', '0%'),
-                    'gender_female': item.get('gender_female', '0%'),
-                    'age_18_24': item.get('age_18_24', '0%'),
-                    'age_25_34': item.get('age_25_34', '0%'),
-                    'age_35_44': item.get('age_35_44', '0%'),
-                    'age_45_plus': item.get('age_45_plus', '0%'),
-                    'city_top1': item.get('city_top1', ''),
-                    'city_top2': item.get('city_top2', ''),
-                    'city_top3': item.get('city_top3', ''),
-                    'interest_top1': item.get('interest_top1', ''),
-                    'interest_top2': item.get('interest_top2', ''),
-                    'interest_top3': item.get('interest_top3', '')
-                })
-                rows.append(row)
-            
-            # 按日期覆盖保存
-            self._save_with_daily_overwrite(self.content_analysis_file, self.content_analysis_fields, rows, self.content_analysis_chinese_headers)
-            
-            logger.info(f"💾 内容分析数据已保存到CSV: {len(rows)} 条记录")
+            assert self._initialized, "CSV存储未初始化"
+            
+            # 处理数据格式，同一批次共享一个时间戳
+            rows = self._build_rows(data, self._ca_columns, _now_iso())
+            
+            # 按日期覆盖保存（经内存缓冲合并后落盘）
+            self._store_today_rows(self.content_analysis_file, self.content_analysis_fields, rows, self.content_analysis_chinese_headers, label='内容分析')
             
         except Exception as e:
             logger.error(f"❌ 保存内容分析数据失败: {e}")
@@ -265,25 +288,13 @@ class CSVStorage(BaseStorage):
             data: 粉丝数据列表
         """
         try:
-            if not self._initialized:
-                self._initialize_sync()
-            
-            # 处理数据格式
-            rows = []
-            for item in data:
-                row = self._add_timestamp({
-                    'timestamp': item.get('timestamp', ''),
-                    'dimension': item.get('dimension', ''),
-                    'total_fans': item.get('total_fans', 0),
-                    'new_fans': item.get('new_fans', 0),
-                    'lost_fans': item.get('lost_fans', 0)
-                })
-                rows.append(row)
-            
-            # 按日期覆盖保存
-            self._save_with_daily_overwrite(self.fans_file, self.fans_fields, rows, self.fans_chinese_headers)
-            
-            logger.info(f"💾 粉丝数据已保存到CSV: {len(rows)} 条记录")
+            assert self._initialized, "CSV存储未初始化"
+            
+            # 处理数据格式，同一批次共享一个时间戳
+            rows = self._build_rows(data, self._fans_columns, _now_iso())
+            
+            # 按日期覆盖保存（经内存缓冲合并后落盘）
+            self._store_today_rows(self.fans_file, self.fans_fields, rows, self.fans_chinese_headers, label='粉丝')
             
         except Exception as e:
             logger.error(f"❌ 保存粉丝数据失败: {e}")
@@ -293,6 +304,21 @@ class CSVStorage(BaseStorage):
         """
         获取最新数据
         
+        Args:
+            data_type: 数据类型 (dashboard, content_analysis, fans)
+            limit: 返回数据条数限制
+            
+        Returns:
+            List[Dict[str, Any]]: 数据列表
+        """
+        return self.read_latest_data(data_type, limit)
+    
+    def read_latest_data(self, data_type: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        同步读取最新数据（纯文件读取，可直接交给asyncio.to_thread执行）
+        
+        只读取已写入文件的数据，开启内存缓冲时不包含尚未落盘的今日数据
+        
         Args:
             data_type: 数据类型 (dashboard, content_analysis, fans)
             limit: 返回数据条数限制
@@ -320,39 +346,74 @@ class CSVStorage(BaseStorage):
             if not file_path.exists():
                 return []
             
-            # 读取CSV文件
-            data = []
-            with open(file_path, 'r', encoding='utf-8') as f:
+            # 逐行读取CSV文件，用堆只保留创建时间最新的limit条，不在内存中保存全部数据
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
                 reader = csv.reader(f)
                 headers = next(reader, None)  # 读取表头
+                if not headers:
+                    return []
                 
-                if headers:
-                    # 检查是否为中文表头
-                    if headers == chinese_headers:
-                        # 中文表头，需要转换为英文字段名
-                        for row in reader:
-                            if len(row) == len(fields):
-                                row_dict = {field: value for field, value in zip(fields, row)}
-                                data.append(row_dict)
-                    else:
-                        # 英文表头或其他格式，直接使用
-                        for row in reader:
-                            if len(row) == len(headers):
-                                row_dict = {header: value for header, value in zip(headers, row)}
-                                data.append(row_dict)
-            
-            # 按创建时间倒序排列，返回最新的limit条
-            data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-            return data[:limit]
+                # 中文表头需要转换为英文字段名，英文表头或其他格式直接使用
+                columns = fields if headers == chinese_headers else headers
+                width = len(columns)
+                rows = (dict(zip(columns, row)) for row in reader if len(row) == width)
+                return heapq.nlargest(limit, rows, key=lambda x: x.get('created_at', ''))
             
         except Exception as e:
             logger.error(f"❌ 获取最新数据失败: {e}")
             return []
     
     async def close(self) -> None:
-        """关闭存储连接"""
+        """关闭存储连接，写入尚未落盘的今日数据"""
+        self.flush()
         logger.debug("📁 CSV存储连接已关闭")
     
+    def _store_today_rows(self, file_path: Path, fields: List[str], rows: List[tuple], chinese_headers: List[str] = None,
+                          label: str = '') -> None:
+        """
+        缓冲今日数据，在flush_interval秒后统一落盘
+        
+        每次保存都会替换该文件的今日数据，因此缓冲中只需保留最后一批；
+        跨天时先写入前一天的缓冲，保证每天的数据各自落在对应日期下
+        
+        Args:
+            file_path: CSV文件路径
+            fields: 英文字段列表
+            rows: 今日数据行
+            chinese_headers: 中文表头列表
+            label: 日志中使用的数据类型名称
+        """
+        if self.flush_interval <= 0:
+            self._save_with_daily_overwrite(file_path, fields, rows, chinese_headers)
+            logger.info(f"💾 {label}数据已保存到CSV: {len(rows)} 条记录")
+            return
+        
+        today = self._get_today_date()
+        with self._buffer_lock:
+            pending = self._buffer.get(file_path)
+            if pending is not None and pending[3] != today:
+                self._save_with_daily_overwrite(file_path, pending[0], pending[1], pending[2], today=pending[3])
+            
+            self._buffer[file_path] = (fields, rows, chinese_headers, today)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        # 此时数据只在内存中，实际落盘由flush记录
+        logger.info(f"💾 {label}数据已缓冲: {len(rows)} 条记录，将在 {self.flush_interval:g} 秒内写入CSV")
+    
+    def flush(self) -> None:
+        """将内存中缓冲的今日数据写入CSV文件"""
+        with self._buffer_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending, self._buffer = self._buffer, {}
+            for file_path, (fields, rows, chinese_headers, date) in pending.items():
+                self._save_with_daily_overwrite(file_path, fields, rows, chinese_headers, today=date)
+                logger.info(f"💾 缓冲数据已写入CSV: {file_path.name} {len(rows)} 条记录")
+    
     def get_storage_info(self) -> Dict[str, Any]:
         """获取存储信息"""
         try:
@@ -373,16 +434,20 @@ class CSVStorage(BaseStorage):
             
             for name, path in files.items():
                 if path.exists():
-                    # 统计记录数（减去表头）
-                    with open(path, 'r', encoding='utf-8') as f:
-                        reader = csv.reader(f)
-                        row_count = sum(1 for _ in reader) - 1  # 减去表头
+                    size_bytes = path.stat().st_size
+                    row_count = self._read_meta_records(path, size_bytes)
+                    if row_count is None:
+                        # 计数文件缺失或已过期，回退到全量扫描并补写计数文件
+                        with open(path, 'r', encoding='utf-8') as f:
+                            reader = csv.reader(f)
+                            row_count = max(0, sum(1 for _ in reader) - 1)  # 减去表头
+                        self._write_meta(path, row_count)
                     
                     info['files'][name] = {
                         'exists': True,
                         'path': str(path),
-                        'records': max(0, row_count),
-                        'size_bytes': path.stat().st_size
+                        'records': row_count,
+                        'size_bytes': size_bytes
                     }
                 else:
                     info['files'][name] = {
@@ -401,98 +466,287 @@ class CSVStorage(BaseStorage):
                 'error': str(e)
             }
     
-    def _add_timestamp(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _build_rows(data: Iterable[Dict[str, Any]], columns: Tuple[Tuple[str, Any], ...], now_iso: str) -> List[tuple]:
         """
-        为数据添加时间戳
+        按字段顺序将原始数据转换为元组行，不再为每行构造中间字典
         
         Args:
             data: 原始数据
+            columns: (字段名, 缺省值) 序列，对应 created_at/updated_at 之后的字段
+            now_iso: 本批次共享的时间戳
+            
+        Returns:
+            List[tuple]: 与字段列表顺序一致的行
+        """
+        return [(now_iso, now_iso, *[item.get(key, default) for key, default in columns]) for item in data]
+    
+    def _serialize_rows(self, file_path: Path, fields: List[str], rows: Iterable[tuple]) -> str:
+        """
+        将整批行格式化为CSV文本
+        
+        纯数值文件直接填充预编译的格式模板；可能包含特殊字符的文件交给单个csv.writer
+        一次性writerows，由C实现完成转义（None写为空字段）
+        
+        Args:
+            file_path: CSV文件路径（用于查找格式模板）
+            fields: 英文字段列表
+            rows: 与字段列表顺序一致的元组行
+            
+        Returns:
+            str: 格式化后的CSV文本
+        """
+        if self._needs_quoting.get(file_path, True):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator='\n').writerows(rows)
+            return buffer.getvalue()
+        
+        fmt = self._row_formats[file_path].format
+        return ''.join([fmt(*row) for row in rows])
+    
+    @staticmethod
+    def _meta_path(file_path: Path) -> Path:
+        """CSV文件对应的计数文件路径"""
+        return file_path.with_name(file_path.name + '.meta.json')
+    
+    def _read_meta_records(self, file_path: Path, size_bytes: int) -> Optional[int]:
+        """
+        从计数文件读取记录数
+        
+        计数文件记录的文件大小与实际不一致时（降级追加、手工编辑等），视为过期
+        
+        Args:
+            file_path: CSV文件路径
+            size_bytes: CSV文件当前大小
             
         Returns:
-            添加时间戳的数据
+            Optional[int]: 记录数，计数文件不存在或已过期时返回None
         """
-        now = datetime.now().isoformat()
-        data['created_at'] = now
-        data['updated_at'] = now
-        return data
+        try:
+            with open(self._meta_path(file_path), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('size_bytes') == size_bytes:
+                return int(meta['records'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+    
+    def _write_meta(self, file_path: Path, records: int) -> None:
+        """
+        原子更新计数文件
+        
+        Args:
+            file_path: CSV文件路径
+            records: 当前记录数（不含表头）
+        """
+        meta_path = self._meta_path(file_path)
+        tmp_path = meta_path.with_name(meta_path.name + '.tmp')
+        try:
+            meta = {
+                'records': records,
+                'size_bytes': file_path.stat().st_size,
+                'last_write': datetime.now().isoformat()
+            }
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, meta_path)
+        except OSError as e:
+            logger.warning(f"⚠️ 更新计数文件失败: {e}")
     
     def _get_today_date(self) -> str:
-        """获取今天的日期字符串"""
-        return datetime.now().strftime('%Y-%m-%d')
+        """获取今天的日期字符串（与记录时间戳使用同一时区）"""
+        return _today_str()
+    
+    def _get_header_line(self, file_path: Path, fields: List[str], chinese_headers: List[str] = None) -> bytes:
+        """
+        获取CSV文件的表头行（已编码，含换行符）
+        
+        Args:
+            file_path: CSV文件路径
+            fields: 英文字段列表
+            chinese_headers: 中文表头列表，为空时降级到英文表头
+        """
+        header = self._header_lines.get(file_path)
+        if header is None:
+            header = (','.join(chinese_headers or fields) + '\n').encode('utf-8')
+        return header
     
-    def _save_with_daily_overwrite(self, file_path: Path, fields: List[str], new_data: List[Dict[str, Any]], chinese_headers: List[str] = None) -> None:
+    def _read_header_line(self, file_path: Path) -> bytes:
+        """读取CSV文件的表头行（统一使用换行符结尾，便于与缓存的表头比较）"""
+        with open(file_path, 'rb') as f:
+            return f.readline().rstrip(b'\r\n') + b'\n'
+    
+    def _find_today_offset(self, file_path: Path, today: str) -> Optional[Tuple[int, int]]:
+        """
+        从文件末尾向前查找今日数据的起始位置
+        
+        数据按时间顺序写入，今日数据总是位于文件末尾，且每行以created_at开头，
+        因此只需读取文件尾部即可定位，代价与今日数据量成正比而非整个历史。
+        文本字段中的换行会被csv.writer包在引号内，使一条记录跨越多个物理行；单条物理行中的
+        引号数为奇数时说明扫描落在引号字段内部，此时无法按行定位，返回None
+        
+        Args:
+            file_path: CSV文件路径
+            today: 今天的日期字符串 (YYYY-MM-DD)
+            
+        Returns:
+            Optional[Tuple[int, int]]: (今日第一行的字节偏移, 今日已有记录数)；没有今日数据时偏移为文件长度
+        """
+        prefix = today.encode('utf-8')
+        today_rows = 0
+        with open(file_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            pos = offset
+            pending = b''
+            while pos > 0:
+                size = min(_TAIL_READ_SIZE, pos)
+                pos -= size
+                f.seek(pos)
+                chunk = f.read(size) + pending
+                lines = chunk.split(b'\n')
+                # 未读到文件开头时，第一段可能是不完整的行，留到下一轮处理
+                pending = lines.pop(0) if pos > 0 else b''
+                line_end = pos + len(chunk)
+                for line in reversed(lines):
+                    line_start = line_end - len(line)
+                    line_end = line_start - 1
+                    if not line.strip():
+                        continue
+                    if line.count(b'"') % 2:
+                        return None
+                    if not line.startswith(prefix):
+                        return offset, today_rows
+                    offset = line_start
+                    today_rows += 1
+        return offset, today_rows
+    
+    def _save_with_daily_overwrite(self, file_path: Path, fields: List[str], new_data: List[tuple], chinese_headers: List[str] = None,
+                                   today: Optional[str] = None) -> None:
         """
         按日期覆盖保存数据
         
+        截断文件末尾的今日旧数据后追加今日新数据，历史数据保持不动
+        
         Args:
             file_path: CSV文件路径
             fields: 英文字段列表
-            new_data: 新数据列表
+            new_data: 新数据行（与字段列表顺序一致的元组）
             chinese_headers: 中文表头列表
+            today: 新数据所属日期 (YYYY-MM-DD)，默认为今天
         """
         try:
-            today = self._get_today_date()
-            
-            # 读取现有数据
-            existing_data = []
-            if file_path.exists():
-                try:
-                    df = pd.read_csv(file_path)
-                    if not df.empty:
-                        # 如果CSV使用中文表头，需要转换为英文字段名
-                        if chinese_headers and len(df.columns) == len(chinese_headers):
-                            # 创建中文到英文的映射
-                            chinese_to_english = {chinese: english for chinese, english in zip(chinese_headers, fields)}
-                            df.rename(columns=chinese_to_english, inplace=True)
-                        
-                        # 过滤掉今天的数据
-                        if 'created_at' in df.columns:
-                            df['date'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d')
-                            df_filtered = df[df['date'] != today]
-                            existing_data = df_filtered.drop('date', axis=1).to_dict('records')
-                        else:
-                            existing_data = df.to_dict('records')
-                except Exception as e:
-                    logger.warning(f"⚠️ 读取现有CSV数据失败: {e}")
-            
-            # 合并数据：保留非今天的数据 + 今天的新数据
-            all_data = existing_data + new_data
-            
-            # 重写整个文件
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                if chinese_headers:
-                    # 使用中文表头
-                    f.write(','.join(chinese_headers) + '\n')
-                    # 写入数据行，按字段顺序
-                    for row in all_data:
-                        values = [str(row.get(field, '')) for field in fields]
-                        f.write(','.join(values) + '\n')
-                else:
-                    # 降级到英文表头
-                    writer = csv.DictWriter(f, fieldnames=fields)
-                    writer.writeheader()
-                    writer.writerows(all_data)
+            if today is None:
+                today = self._get_today_date()
             
-            logger.info(f"💾 数据已按日期覆盖保存: 保留 {len(existing_data)} 条历史记录，新增 {len(new_data)} 条今日记录")
+            if not file_path.exists():
+                self._init_csv_file(file_path, fields, chinese_headers)
+            
+            # 表头与当前字段定义不一致（旧版本文件），走完整重写完成迁移
+            if self._read_header_line(file_path) != self._get_header_line(file_path, fields, chinese_headers):
+                self._rewrite_csv_file(file_path, fields, new_data, chinese_headers, today)
+                return
+            
+            # 写入前读取计数，写入后据此增量更新，避免重新扫描整个文件
+            previous = self._read_meta_records(file_path, file_path.stat().st_size)
+            
+            located = self._find_today_offset(file_path, today)
+            if located is None:
+                # 文件尾部含有跨行的引号字段，改为完整解析重写
+                self._rewrite_csv_file(file_path, fields, new_data, chinese_headers, today)
+                return
+            offset, replaced = located
+            
+            with open(file_path, 'r+b', buffering=_WRITE_BUFFER_SIZE) as f:
+                # 确保追加位置处于新行开头
+                prefix = b''
+                if offset > 0:
+                    f.seek(offset - 1)
+                    if f.read(1) != b'\n':
+                        prefix = b'\n'
+                f.seek(offset)
+                f.truncate()
+                f.write(prefix + self._serialize_rows(file_path, fields, new_data).encode('utf-8'))
+            
+            if previous is not None:
+                self._write_meta(file_path, previous - replaced + len(new_data))
+            
+            logger.info(f"💾 数据已按日期覆盖保存: 替换 {replaced} 条今日旧记录，新增 {len(new_data)} 条今日记录")
             
         except Exception as e:
             logger.error(f"❌ 按日期覆盖保存失败: {e}")
             # 降级到追加模式
             self._append_to_csv(file_path, fields, new_data)
     
-    def _append_to_csv(self, file_path: Path, fields: List[str], data: List[Dict[str, Any]]) -> None:
+    def _rewrite_csv_file(self, file_path: Path, fields: List[str], new_data: List[tuple], chinese_headers: List[str] = None,
+                          today: Optional[str] = None) -> None:
+        """
+        重写整个CSV文件（表头与当前字段定义不一致时使用，顺带完成表头迁移）
+        
+        逐行流式读取旧文件，丢弃今日数据并按当前字段顺序写入临时文件，最后原子替换
+        
+        Args:
+            file_path: CSV文件路径
+            fields: 英文字段列表
+            new_data: 新数据行（与字段列表顺序一致的元组）
+            chinese_headers: 中文表头列表
+            today: 新数据所属日期 (YYYY-MM-DD)，默认为今天
+        """
+        try:
+            if today is None:
+                today = self._get_today_date()
+            field_order = tuple(fields)
+            chinese_to_english = {chinese: english for english, chinese in self.field_chinese_mapping.items()}
+            tmp_path = file_path.with_name(file_path.name + '.tmp')
+            kept = 0
+            
+            with open(tmp_path, 'w', buffering=_WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as out:
+                out.write(self._get_header_line(file_path, fields, chinese_headers).decode('utf-8'))
+                writer = csv.writer(out, lineterminator='\n')
+                
+                # 保留非今天的历史数据
+                if file_path.exists():
+                    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+                        reader = csv.reader(f)
+                        headers = next(reader, None)
+                        if headers:
+                            # 旧文件的表头可能是中文或英文，统一映射为英文字段名
+                            columns = [chinese_to_english.get(header, header) for header in headers]
+                            created_idx = columns.index('created_at') if 'created_at' in columns else None
+                            writerow = writer.writerow
+                            for row in reader:
+                                if not row:
+                                    continue
+                                if created_idx is not None and created_idx < len(row) and row[created_idx][:10] == today:
+                                    continue
+                                row_dict = dict(zip(columns, row))
+                                writerow([row_dict.get(field, '') for field in field_order])
+                                kept += 1
+                
+                # 追加今天的新数据
+                writer.writerows(new_data)
+            
+            os.replace(tmp_path, file_path)
+            self._write_meta(file_path, kept + len(new_data))
+            logger.info(f"💾 数据已按日期覆盖保存: 保留 {kept} 条历史记录，新增 {len(new_data)} 条今日记录")
+            
+        except Exception as e:
+            logger.error(f"❌ 重写CSV文件失败: {e}")
+            # 降级到追加模式
+            self._append_to_csv(file_path, fields, new_data)
+    
+    def _append_to_csv(self, file_path: Path, fields: List[str], data: List[tuple]) -> None:
         """
         追加数据到CSV文件（降级方案）
         
         Args:
             file_path: CSV文件路径
             fields: 字段列表
-            data: 数据列表
+            data: 数据行（与字段列表顺序一致的元组）
         """
         try:
-            with open(file_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fields)
-                writer.writerows(data)
+            with open(file_path, 'a', buffering=_WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as f:
+                csv.writer(f, lineterminator='\n').writerows(data)
             logger.info(f"💾 数据已追加保存: {len(data)} 条记录")
         except Exception as e:
             logger.error(f"❌ 追加保存失败: {e}")
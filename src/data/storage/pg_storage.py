@@ -4,7 +4,7 @@ PostgreSQL数据存储实现（占位代码）
 TODO: 等主程序及整体功能测试通过后再实现
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 
 from .base import BaseStorage
 from ...utils.logger import get_logger
@@ -55,12 +55,12 @@ class PostgreSQLStorage(BaseStorage):
         logger.warning("⚠️ PostgreSQL存储暂未实现")
         return False
     
-    async def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> bool:
+    async def save_content_analysis_data(self, data: Iterable[Dict[str, Any]]) -> bool:
         """
         保存内容分析数据到PostgreSQL
         
         Args:
-            data: 内容分析数据列表
+            data: 内容分析数据，可以是列表或逐条产出的可迭代对象
             
         Returns:
             bool: 保存是否成功
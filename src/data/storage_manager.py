@@ -5,11 +5,14 @@
 """
 
 import os
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, TYPE_CHECKING
 from .storage.base import BaseStorage
 from .storage.csv_storage import CSVStorage
-from .storage.pg_storage import PostgreSQLStorage
+
+if TYPE_CHECKING:
+    from .storage.pg_storage import PostgreSQLStorage
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +22,7 @@ class StorageManager:
     
     def __init__(self):
         self._csv_storage: Optional[CSVStorage] = None
-        self._pg_storage: Optional[PostgreSQLStorage] = None
+        self._pg_storage: Optional['PostgreSQLStorage'] = None
         self._initialized = False
         
     def initialize(self, data_path: Optional[str] = None, 
@@ -40,7 +43,10 @@ class StorageManager:
             
         # 初始化CSV存储（始终启用）
         try:
-            csv_config = {'data_dir': data_path}
+            csv_config = {
+                'data_dir': data_path,
+                'flush_interval': float(os.getenv('CSV_FLUSH_INTERVAL', '0'))
+            }
             self._csv_storage = CSVStorage(csv_config)
             logger.info(f"CSV存储已初始化，数据路径: {data_path}")
         except Exception as e:
@@ -55,8 +61,9 @@ class StorageManager:
             if database_config is None:
                 database_config = self._get_database_config_from_env()
                 
-            # 初始化PostgreSQL存储
+            # 初始化PostgreSQL存储（默认未启用，仅在需要时导入）
             try:
+                from .storage.pg_storage import PostgreSQLStorage
                 self._pg_storage = PostgreSQLStorage(database_config)
                 logger.info("PostgreSQL存储已启用")
             except Exception as e:
@@ -93,60 +100,84 @@ class StorageManager:
             self.initialize()
         return self._csv_storage
         
-    def get_pg_storage(self) -> Optional[PostgreSQLStorage]:
+    def get_pg_storage(self) -> Optional['PostgreSQLStorage']:
         """获取PostgreSQL存储实例"""
         if not self._initialized:
             self.initialize()
         return self._pg_storage
         
-    def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
-        """保存仪表板数据"""
+    def _save_to_backends(self, method: str, label: str, data: Iterable[Dict[str, Any]]) -> None:
+        """
+        依次同步写入所有已启用的存储后端
+        
+        各后端的异常分别记录，互不影响。CSV作为主存储，失败时向上抛出
+        
+        Args:
+            method: 存储后端的保存方法名
+            label: 日志中使用的数据类型名称
+            data: 待保存的数据
+        """
         if not self._initialized:
             self.initialize()
             
-        # 保存到CSV（始终执行）
-        if self._csv_storage:
-            self._csv_storage.save_dashboard_data(data)
+        # 同时写入多个存储时，生成器只能消费一次，需要先物化
+        if self._pg_storage and not isinstance(data, list):
+            data = list(data)
             
-        # 保存到PostgreSQL（如果启用）
-        if self._pg_storage:
+        csv_error = None
+        if self._csv_storage:
             try:
-                self._pg_storage.save_dashboard_data(data)
+                getattr(self._csv_storage, method)(data)
             except Exception as e:
-                logger.error(f"保存仪表板数据到PostgreSQL失败: {e}")
+                logger.error(f"保存{label}数据到CSV失败: {e}")
+                csv_error = e
                 
-    def save_content_analysis_data(self, data: List[Dict[str, Any]]) -> None:
-        """保存内容分析数据"""
-        if not self._initialized:
-            self.initialize()
-            
-        # 保存到CSV（始终执行）
-        if self._csv_storage:
-            self._csv_storage.save_content_analysis_data(data)
-            
-        # 保存到PostgreSQL（如果启用）
         if self._pg_storage:
+            # PostgreSQL存储的接口是协程；已有事件循环的线程中无法同步等待，只记录警告
+            coro = getattr(self._pg_storage, method)(data)
             try:
-                self._pg_storage.save_content_analysis_data(data)
-            except Exception as e:
-                logger.error(f"保存内容分析数据到PostgreSQL失败: {e}")
+                asyncio.get_running_loop()
+            except RuntimeError:
+                try:
+                    asyncio.run(coro)
+                except Exception as e:
+                    logger.error(f"保存{label}数据到PostgreSQL失败: {e}")
+            else:
+                coro.close()
+                logger.warning(f"事件循环中无法同步写入PostgreSQL，{label}数据请使用async_save_*方法保存")
+                
+        if csv_error is not None:
+            raise csv_error
+        
+    def save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
+        """保存仪表板数据（同步写入各存储后端）"""
+        self._save_to_backends('save_dashboard_data', '仪表板', data)
+                
+    def save_content_analysis_data(self, data: Iterable[Dict[str, Any]]) -> None:
+        """保存内容分析数据（同步写入各存储后端）"""
+        self._save_to_backends('save_content_analysis_data', '内容分析', data)
                 
     def save_fans_data(self, data: List[Dict[str, Any]]) -> None:
-        """保存粉丝数据"""
-        if not self._initialized:
-            self.initialize()
-            
-        # 保存到CSV（始终执行）
+        """保存粉丝数据（同步写入各存储后端）"""
+        self._save_to_backends('save_fans_data', '粉丝', data)
+        
+    async def async_save_dashboard_data(self, data: List[Dict[str, Any]]) -> None:
+        """异步保存仪表板数据，在工作线程中执行同步写入，不阻塞事件循环"""
+        await asyncio.to_thread(self.save_dashboard_data, data)
+        
+    async def async_save_content_analysis_data(self, data: Iterable[Dict[str, Any]]) -> None:
+        """异步保存内容分析数据，在工作线程中执行同步写入，不阻塞事件循环"""
+        await asyncio.to_thread(self.save_content_analysis_data, data)
+        
+    async def async_save_fans_data(self, data: List[Dict[str, Any]]) -> None:
+        """异步保存粉丝数据，在工作线程中执行同步写入，不阻塞事件循环"""
+        await asyncio.to_thread(self.save_fans_data, data)
+                
+    def flush(self) -> None:
+        """将CSV存储中缓冲的今日数据立即写入文件"""
         if self._csv_storage:
-            self._csv_storage.save_fans_data(data)
+            self._csv_storage.flush()
             
-        # 保存到PostgreSQL（如果启用）
-        if self._pg_storage:
-            try:
-                self._pg_storage.save_fans_data(data)
-            except Exception as e:
-                logger.error(f"保存粉丝数据到PostgreSQL失败: {e}")
-                
     def get_storage_info(self) -> Dict[str, Any]:
         """获取存储信息"""
         if not self._initialized:
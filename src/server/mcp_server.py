@@ -6,28 +6,482 @@
 
 import os
 import json
+import logging
+import logging.handlers
+import queue
 import asyncio
 import signal
 import sys
 import socket
-import uuid
 import time
-from pathlib import Path
-from typing import Dict, Any
-from dataclasses import dataclass, asdict
+import threading
+import heapq
+import base64
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 
+import uvicorn
 from fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时退回标准库json
+    orjson = None
+
 from ..core.config import XHSConfig
 from ..core.exceptions import format_error_message, XHSToolkitError
 from ..xiaohongshu.client import XHSClient
 from ..xiaohongshu.models import XHSNote
 from ..utils.logger import get_logger, setup_logger
+from ..utils.text_utils import parse_topics_string, extract_and_clean_topics_from_content
 from ..data import storage_manager, data_scheduler
 from ..auth.smart_auth_server import SmartAuthServer, create_smart_auth_server
 
 logger = get_logger(__name__)
 
+# 关闭浏览器的最长等待时间（秒），chromedriver无响应时不再阻塞退出
+_CLEANUP_DEADLINE = 5.0
+
+# check_task_status长轮询的最长等待时间（秒）
+_MAX_STATUS_WAIT = 60.0
+
+# cookies文件存在性检查结果的缓存时间（秒）
+_COOKIES_CHECK_TTL = 2.0
+
+# 存储信息（需要扫描数据目录）的缓存时间（秒）
+_STORAGE_INFO_TTL = 60.0
+
+# batch_publish_from_json同时准备（解析文案、下载图片）的条目数上限
+_MAX_CONCURRENT_PREPARE = 2
+
+
+@lru_cache(maxsize=1)
+def _get_local_ip() -> Optional[str]:
+    """
+    获取本机内网IP地址（进程内只探测一次）
+    
+    对UDP套接字执行connect只会查询路由表选择出口地址，不会发送数据包，也不涉及DNS解析
+    
+    Returns:
+        Optional[str]: 内网IP地址，无法获取时返回None
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.254.254.254", 80))
+            return s.getsockname()[0]
+    except OSError:
+        return None
+
+
+def _install_uvloop() -> bool:
+    """
+    使用uvloop作为asyncio事件循环策略
+    
+    uvloop为可选依赖（不支持Windows），未安装时保持默认事件循环
+    
+    Returns:
+        bool: 是否已启用uvloop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("⚡ 已启用uvloop事件循环")
+    return True
+
+
+def _enable_slow_callback_warnings(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    按需开启事件循环阻塞检测（设置XHS_LOOP_BLOCK_WARN_MS时启用）
+    
+    开启asyncio调试模式，单次回调执行超过阈值时由asyncio记录警告日志，日志中包含所在任务和协程，
+    可据此定位在事件循环中执行阻塞调用的工具。调试模式有额外开销，仅用于排查问题
+    
+    Args:
+        loop: 正在运行的事件循环
+        
+    Returns:
+        bool: 是否已启用
+    """
+    threshold_ms = float(os.getenv('XHS_LOOP_BLOCK_WARN_MS', '0') or 0)
+    if threshold_ms <= 0:
+        return False
+    loop.set_debug(True)
+    loop.slow_callback_duration = threshold_ms / 1000
+    logger.info(f"🔍 已启用事件循环阻塞检测，阈值 {threshold_ms:.0f} 毫秒")
+    return True
+
+
+def _bind_listener(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """
+    校验监听地址并预先绑定SSE服务的TCP监听套接字
+    
+    只开启SO_REUSEADDR以便重启时立即复用处于TIME_WAIT的端口；不开启SO_REUSEPORT，
+    SSE会话和发布任务都保存在进程内，端口已被其他实例占用时应直接报错。
+    地址族与uvicorn自行绑定时一致：含冒号的IPv6地址用AF_INET6，其余（包括localhost等主机名）用AF_INET
+    
+    Args:
+        host: 监听地址
+        port: 监听端口
+        backlog: 连接队列长度
+        
+    Returns:
+        socket.socket: 已绑定并处于监听状态的套接字
+        
+    Raises:
+        ValueError: 监听地址无法解析时抛出
+        OSError: 绑定端口失败时抛出
+    """
+    family = socket.AF_INET6 if host and ":" in host else socket.AF_INET
+    try:
+        # IP字面量直接按数字地址解析，不触发DNS查询
+        infos = socket.getaddrinfo(host or None, port, family=family, type=socket.SOCK_STREAM,
+                                   flags=socket.AI_PASSIVE | socket.AI_NUMERICHOST)
+    except socket.gaierror:
+        # 主机名只在这里解析一次，之后uvicorn直接使用已绑定的套接字
+        try:
+            infos = socket.getaddrinfo(host or None, port, family=family, type=socket.SOCK_STREAM,
+                                       flags=socket.AI_PASSIVE)
+        except socket.gaierror as e:
+            raise ValueError(f"无效的监听地址 {host}:{port}: {e}") from e
+    
+    family, socktype, proto, _, sockaddr = infos[0]
+    sock = socket.socket(family, socktype, proto)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(sockaddr)
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+@lru_cache(maxsize=1)
+def _auto_collection_enabled() -> bool:
+    """
+    是否启用自动数据采集（ENABLE_AUTO_COLLECTION=true）
+    
+    与_pretty_json相同，.env加载后首次调用时读取一次环境变量
+    """
+    return os.getenv('ENABLE_AUTO_COLLECTION', 'false').lower() == 'true'
+
+
+@lru_cache(maxsize=1)
+def _pretty_json() -> bool:
+    """
+    是否输出带缩进的JSON（XHS_PRETTY_JSON=1时启用，便于调试）
+    
+    .env在XHSConfig初始化时才加载，因此首次序列化时再读取环境变量
+    """
+    return os.getenv('XHS_PRETTY_JSON', '0').lower() in ('1', 'true')
+
+
+# 失败响应的JSON模板，分别与_dumps的紧凑输出和缩进输出格式一致
+_ERROR_TEMPLATE = '{"success":false,"message":%s}'
+_ERROR_WITH_SUGGESTION_TEMPLATE = '{"success":false,"message":%s,"suggestion":%s}'
+_PRETTY_ERROR_TEMPLATE = '{\n  "success": false,\n  "message": %s\n}'
+_PRETTY_ERROR_WITH_SUGGESTION_TEMPLATE = '{\n  "success": false,\n  "message": %s,\n  "suggestion": %s\n}'
+
+
+# 未安装orjson时使用的标准库编码器，模块加载时创建一次，避免json.dumps每次调用都重新构造编码器
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_PRETTY_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def _json_str(value: str) -> str:
+    """将字符串编码为JSON字符串字面量（中文不转义）"""
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return _JSON_ENCODER.encode(value)
+
+
+def _error_json(message: str, suggestion: Optional[str] = None) -> str:
+    """
+    生成失败响应的JSON字符串
+    
+    直接填充预先生成的模板，无需构造字典再走完整的JSON编码；插入的字符串均经过JSON转义
+    
+    Args:
+        message: 错误信息
+        suggestion: 处理建议（可选）
+    """
+    pretty = _pretty_json()
+    if suggestion is None:
+        return (_PRETTY_ERROR_TEMPLATE if pretty else _ERROR_TEMPLATE) % _json_str(message)
+    template = _PRETTY_ERROR_WITH_SUGGESTION_TEMPLATE if pretty else _ERROR_WITH_SUGGESTION_TEMPLATE
+    return template % (_json_str(message), _json_str(suggestion))
+
+
+# 最近一次格式化的时间戳缓存：[整秒时间, 格式化结果]
+_last_ts = [0, ""]
+
+
+def _now_str() -> str:
+    """
+    获取当前时间字符串（YYYY-MM-DD HH:MM:SS）
+    
+    同一秒内的多次调用复用上次的格式化结果；工具都在事件循环线程中执行，无需加锁
+    """
+    now = int(time.time())
+    if now != _last_ts[0]:
+        _last_ts[:] = [now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))]
+    return _last_ts[1]
+
+
+def _plan_batch_layers(calls: List[Dict[str, Any]], tools: Dict[str, Any]) -> Tuple[List[str], List[List[int]]]:
+    """
+    校验batch_execute的调用列表，并按input_from依赖关系分层
+    
+    同一层内的调用互不依赖，可以并发执行；每层只依赖前面的层
+    
+    Args:
+        calls: 调用列表
+        tools: 可调用的工具名集合
+        
+    Returns:
+        Tuple[List[str], List[List[int]]]: (每个调用的ID, 按执行顺序排列的调用下标分层)
+        
+    Raises:
+        ValueError: 工具名未知、ID重复、依赖不存在或存在循环依赖时抛出
+    """
+    call_ids = [str(call.get("id", index)) if isinstance(call, dict) else str(index) for index, call in enumerate(calls)]
+    index_by_id = {}
+    for index, call in enumerate(calls):
+        if not isinstance(call, dict):
+            raise ValueError(f"第 {index + 1} 个调用必须是对象")
+        if call.get("tool") not in tools:
+            raise ValueError(f"未知工具: {call.get('tool')}")
+        if call_ids[index] in index_by_id:
+            raise ValueError(f"调用ID重复: {call_ids[index]}")
+        index_by_id[call_ids[index]] = index
+    
+    # Kahn拓扑排序，每一轮入度为0的调用组成一层
+    dependents: Dict[int, List[int]] = {index: [] for index in range(len(calls))}
+    pending = [0] * len(calls)
+    for index, call in enumerate(calls):
+        for source_id in set((call.get("input_from") or {}).values()):
+            if source_id not in index_by_id:
+                raise ValueError(f"input_from引用了不存在的调用: {source_id}")
+            dependents[index_by_id[source_id]].append(index)
+            pending[index] += 1
+    
+    layers = []
+    layer = [index for index in range(len(calls)) if pending[index] == 0]
+    while layer:
+        layers.append(layer)
+        next_layer = []
+        for index in layer:
+            for dependent in dependents[index]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    next_layer.append(dependent)
+        layer = next_layer
+    
+    if sum(len(layer) for layer in layers) != len(calls):
+        raise ValueError("input_from存在循环依赖")
+    return call_ids, layers
+
+
+def _loads(data: str) -> Any:
+    """
+    解析工具参数和工具结果中的JSON字符串
+    
+    优先使用orjson；orjson.JSONDecodeError是json.JSONDecodeError的子类，调用方的异常处理无需区分
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> str:
+    """
+    序列化工具和资源返回的JSON（中文不转义）
+    
+    MCP客户端是程序，默认输出紧凑JSON；设置XHS_PRETTY_JSON=1时使用两空格缩进。
+    优先使用orjson，未安装时使用标准库json，两者输出格式一致
+    """
+    if _pretty_json():
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        return _PRETTY_JSON_ENCODER.encode(obj)
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return _JSON_ENCODER.encode(obj)
+
+
+# xhs://help 资源内容（静态文本，模块加载时生成一次）
+_HELP_TEXT = """
+# 小红书MCP服务器使用帮助
+
+## 可用工具
+
+### 1. test_connection
+- 功能: 测试MCP连接
+- 参数: 无
+
+### 2. smart_publish_note
+- 功能: 智能发布小红书笔记（支持多种输入格式）
+- 参数:
+  - title: 笔记标题
+  - content: 笔记内容
+  - images: 图片（支持本地路径、网络URL、混合数组）
+  - videos: 视频路径（目前仅支持本地文件）
+  - topics: 话题（支持字符串或数组格式）
+  - location: 位置信息
+
+### 3. check_task_status
+- 功能: 检查发布任务状态
+- 参数:
+  - task_id: 任务ID
+  - wait_seconds: 任务未完成时等待状态变化的秒数（可选，默认0立即返回，最长60秒）
+
+### 4. get_task_result
+- 功能: 获取已完成任务的结果
+- 参数:
+  - task_id: 任务ID
+
+### 5. login_xiaohongshu
+- 功能: 智能登录小红书
+- 参数:
+  - force_relogin: 是否强制重新登录
+  - quick_mode: 快速模式
+
+### 6. get_creator_data_analysis
+- 功能: 获取创作者数据用于分析
+- 参数:
+  - limit: 每类数据返回的最新记录数（可选，默认: 100），只需概览时可调小以减少返回数据量
+
+### 7. publish_from_json
+- 功能: 通过JSON字符串发布内容到小红书
+- 参数:
+  - json_data: JSON格式的字符串，包含发布内容
+  - title: 自定义标题（可选，不提供则从文案中提取）
+
+### 8. batch_publish_from_json
+- 功能: 批量处理JSON字符串中的多个数据条目并发布到小红书
+- 参数:
+  - json_data: JSON格式的字符串，包含多个发布条目
+  - max_items: 最大处理条目数（默认: 5）
+
+### 9. preview_json_data
+- 功能: 预览JSON数据内容，不执行发布操作
+- 参数:
+  - json_data: JSON格式的字符串
+
+### 10. batch_execute
+- 功能: 在一次调用中批量执行多个工具（互不依赖的调用并发执行）
+- 参数:
+  - calls: 调用列表，每项包含 tool、args，可选 id 和 input_from（把其他调用的结果作为参数）
+  - max_concurrent: 最大并发数（默认: 4）
+  - stop_on_error: 出错后是否跳过后续调用（默认: false）
+  - timeout_ms: 单个调用的超时时间（默认: 30000）
+
+## JSON数据格式
+
+### 单个条目格式:
+```json
+{
+  "fengmian": "https://example.com/cover.jpg",
+  "jiewei": "https://example.com/end.jpg",
+  "neirongtu": ["https://example.com/img1.jpg", "https://example.com/img2.jpg"],
+  "wenan": "文案内容..."
+}
+```
+
+### 批量条目格式:
+```json
+[
+  {
+    "fengmian": "https://example.com/cover1.jpg",
+    "neirongtu": ["https://example.com/img1.jpg"],
+    "wenan": "第一条文案内容..."
+  },
+  {
+    "fengmian": "https://example.com/cover2.jpg",
+    "neirongtu": ["https://example.com/img2.jpg"],
+    "wenan": "第二条文案内容..."
+  }
+]
+```
+
+## 字段说明
+
+- **fengmian**: 封面图片URL（可选）
+- **jiewei**: 结尾图片URL（可选）
+- **neirongtu**: 内容图片URL数组（可选）
+- **wenan**: 文案内容（必需）
+
+## 可用资源
+
+- xhs://config - 查看服务器配置
+- xhs://help - 查看此帮助信息
+
+## 环境变量
+
+- CHROME_PATH: Chrome浏览器路径
+- WEBDRIVER_CHROME_DRIVER: ChromeDriver路径
+- json_path: Cookies文件路径
+- ENABLE_AUTO_COLLECTION: 是否启用自动数据采集
+
+## 使用流程
+
+1. 使用 `login_xiaohongshu()` 登录小红书
+2. 使用 `preview_json_data()` 预览JSON数据内容
+3. 使用 `publish_from_json()` 或 `batch_publish_from_json()` 发布内容
+4. 使用 `check_task_status()` 查看发布进度
+5. 使用 `get_task_result()` 获取发布结果
+"""
+
+# 内容创作提示词模板
+_PROMPT_TEMPLATE = """
+请帮我创作一篇关于"{topic}"的小红书笔记，风格为"{style}"。
+
+要求：
+1. 标题要吸引人，包含emoji和关键词
+2. 内容要有价值，包含具体的建议或信息
+3. 适当使用emoji让内容更生动
+4. 添加相关标签（3-5个）
+5. 字数控制在200-500字
+6. 语言风格要贴近小红书用户习惯
+
+请按以下格式输出：
+
+【标题】
+[在这里写标题]
+
+【正文】
+[在这里写正文内容]
+
+【标签】
+[在这里列出相关标签]
+
+【发布建议】
+[发布时间、配图建议等]
+"""
+
+# 启动时输出的MCP工具列表（SSE和stdio模式共用，整体作为一条日志输出）
+_TOOLS_BANNER = "\n".join([
+    "🎯 MCP工具列表:",
+    "   • test_connection - 测试MCP连接",
+    "   • smart_publish_note - 发布小红书笔记（支持智能路径解析）",
+    "   • check_task_status - 检查发布任务状态",
+    "   • get_task_result - 获取已完成任务的结果",
+    "   • login_xiaohongshu - 智能登录小红书",
+    "   • get_creator_data_analysis - 获取创作者数据用于分析",
+    "   • publish_from_json - 通过JSON字符串发布内容到小红书",
+    "   • batch_publish_from_json - 批量处理JSON字符串中的多个数据条目并发布到小红书",
+    "   • preview_json_data - 预览JSON数据内容，不执行发布操作",
+    "   • batch_execute - 在一次调用中批量执行多个工具"
+])
+
 
 @dataclass
 class PublishTask:
@@ -40,29 +494,59 @@ class PublishTask:
     result: Dict[str, Any] = None
     start_time: float = None
     end_time: float = None
+    # 笔记摘要在任务创建时计算一次，笔记内容在任务期间不会变化
+    _note_summary: Dict[str, Any] = field(default=None, init=False, repr=False, compare=False)
+    # 任务状态变化通知，供check_task_status长轮询等待
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._note_summary = {
+            'note_title': self.note.title,
+            'note_has_images': bool(self.note.images),
+            'note_has_videos': bool(self.note.videos)
+        }
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        # 移除note对象，避免序列化问题
-        if 'note' in data:
-            data['note_title'] = self.note.title
-            data['note_has_images'] = bool(self.note.images)
-            data['note_has_videos'] = bool(self.note.videos)
-            del data['note']
+        """转换为字典（不包含note对象，避免序列化问题和深拷贝笔记内容）"""
+        data = {
+            'task_id': self.task_id,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'result': self.result,
+            'start_time': self.start_time,
+            'end_time': self.end_time
+        }
+        data.update(self._note_summary)
         return data
 
 
 class TaskManager:
     """任务管理器"""
     
-    def __init__(self):
-        self.tasks: Dict[str, PublishTask] = {}
+    def __init__(self, max_age_seconds: int = 3600, max_tasks: int = 1024):
+        """
+        初始化任务管理器
+        
+        Args:
+            max_age_seconds: 任务结束后保留的秒数，超时后自动清理
+            max_tasks: 最多保留的任务数，超出时按最近最少使用淘汰已结束的任务
+        """
+        # 按访问顺序排列，队头为最久未使用的任务
+        self.tasks: "OrderedDict[str, PublishTask]" = OrderedDict()
+        self.max_tasks = max_tasks
+        # 单调递增的任务编号，以毫秒时间戳为起点（截断到40位），进程内不会重复且按创建顺序排列
+        self._id_counter = itertools.count(int(time.time() * 1000) & 0xFFFFFFFFFF)
         self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.max_age_seconds = max_age_seconds
+        # 按过期时间排序的最小堆：(过期时间, 任务ID)，任务结束时入堆
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_task: Optional[asyncio.Task] = None
     
     def create_task(self, note: XHSNote) -> str:
         """创建新任务"""
-        task_id = str(uuid.uuid4())[:8]  # 使用短ID
+        # 40位编号经base32编码恰好为8个字符（短ID），计数越过40位时回绕
+        task_id = base64.b32encode((next(self._id_counter) & 0xFFFFFFFFFF).to_bytes(5, 'big')).decode().lower()
         task = PublishTask(
             task_id=task_id,
             status="pending",
@@ -72,17 +556,36 @@ class TaskManager:
             start_time=time.time()
         )
         self.tasks[task_id] = task
+        self._evict_overflow()
+        self._ensure_expiry_loop()
         logger.info(f"📋 创建新任务: {task_id} - {note.title}")
         return task_id
     
     def get_task(self, task_id: str) -> PublishTask:
         """获取任务"""
-        return self.tasks.get(task_id)
+        task = self.tasks.get(task_id)
+        if task is not None:
+            self.tasks.move_to_end(task_id)
+        return task
+    
+    def _evict_overflow(self) -> None:
+        """任务数超过上限时，从最久未使用的一端淘汰已结束的任务，运行中的任务不淘汰"""
+        while len(self.tasks) > self.max_tasks:
+            victim = next(
+                (task_id for task_id, task in self.tasks.items() if task.status in ("completed", "failed")),
+                None
+            )
+            if victim is None:
+                logger.warning(f"⚠️ 任务数 {len(self.tasks)} 超过上限 {self.max_tasks}，但没有可淘汰的已结束任务")
+                break
+            del self.tasks[victim]
+            logger.info(f"🗑️ 任务数超过上限，淘汰任务: {victim}")
     
     def update_task(self, task_id: str, status: str = None, progress: int = None, message: str = None, result: Dict = None):
         """更新任务状态"""
         if task_id in self.tasks:
             task = self.tasks[task_id]
+            self.tasks.move_to_end(task_id)
             if status:
                 task.status = status
             if progress is not None:
@@ -93,22 +596,220 @@ class TaskManager:
                 task.result = result
             if status in ["completed", "failed"]:
                 task.end_time = time.time()
+                heapq.heappush(self._expiry_heap, (task.end_time + self.max_age_seconds, task_id))
+            # 唤醒所有正在等待状态变化的check_task_status调用
+            task._changed.set()
+            task._changed.clear()
             logger.info(f"📋 更新任务 {task_id}: {status} ({progress}%) - {message}")
     
-    def remove_old_tasks(self, max_age_seconds: int = 3600):
-        """移除超过指定时间的旧任务"""
-        current_time = time.time()
-        expired_tasks = []
-        for task_id, task in self.tasks.items():
-            if task.end_time and (current_time - task.end_time) > max_age_seconds:
-                expired_tasks.append(task_id)
+    def remove_old_tasks(self) -> int:
+        """
+        移除已过期的旧任务
+        
+        只弹出堆顶已到期的条目，未到期的任务不会被遍历
         
-        for task_id in expired_tasks:
+        Returns:
+            int: 清理的任务数量
+        """
+        now = time.time()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, task_id = heapq.heappop(self._expiry_heap)
+            task = self.tasks.get(task_id)
+            # 任务可能已被清理，或在入堆后再次结束（以最新的结束时间为准）
+            if task is None or task.end_time is None or task.end_time + self.max_age_seconds > now:
+                continue
+            
             del self.tasks[task_id]
             if task_id in self.running_tasks:
                 self.running_tasks[task_id].cancel()
                 del self.running_tasks[task_id]
+            removed += 1
             logger.info(f"🗑️ 清理过期任务: {task_id}")
+        return removed
+    
+    async def _expiry_loop(self) -> None:
+        """后台清理协程：休眠到堆顶任务过期再清理，没有已结束的任务时每分钟检查一次"""
+        while True:
+            if self._expiry_heap:
+                await asyncio.sleep(max(0.0, self._expiry_heap[0][0] - time.time()))
+            else:
+                await asyncio.sleep(60)
+            self.remove_old_tasks()
+    
+    def _ensure_expiry_loop(self) -> None:
+        """在当前事件循环中启动后台清理协程（只启动一次）"""
+        if self._expiry_task is not None and not self._expiry_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 不在事件循环中（如同步调用），等下次创建任务时再启动
+        self._expiry_task = loop.create_task(self._expiry_loop())
+
+
+class _ClientLoop:
+    """
+    池中客户端专用的后台事件循环线程
+    
+    XHSClient的发布步骤虽然是协程，内部却是阻塞的Selenium调用；每个客户端固定绑定一个线程及其事件循环，
+    所有步骤都在这个循环中执行，既不占用服务器的事件循环，客户端内部与循环绑定的状态也始终属于同一个循环
+    """
+    
+    def __init__(self, name: str):
+        """
+        创建事件循环并启动线程
+        
+        Args:
+            name: 线程名称
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_forever, name=name, daemon=True)
+        self._thread.start()
+    
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+    
+    async def run(self, coro) -> Any:
+        """
+        在该客户端的事件循环中执行协程并等待结果（取消等待时同时取消该协程）
+        
+        Args:
+            coro: 客户端的协程
+            
+        Returns:
+            Any: 协程的返回值
+        """
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+    
+    def close(self) -> None:
+        """停止事件循环，线程随之退出"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class XHSClientPool:
+    """
+    发布任务使用的XHSClient池
+    
+    客户端按需创建，数量不超过池大小；任务结束后归还，保留已启动的浏览器供下个任务复用，
+    避免每个任务都冷启动Chrome，同时限制同时运行的Chrome实例数量
+    """
+    
+    def __init__(self, config: XHSConfig, size: int):
+        """
+        初始化客户端池
+        
+        Args:
+            config: 配置管理器实例
+            size: 池大小（同时使用的客户端上限）
+        """
+        self.config = config
+        self.size = size
+        self.clients: List[XHSClient] = []  # 已创建的全部客户端
+        self._loops: Dict[XHSClient, _ClientLoop] = {}  # 每个客户端专用的事件循环
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(size)
+    
+    @staticmethod
+    def _is_browser_alive(client: XHSClient) -> bool:
+        """检查客户端的浏览器是否仍可用（读取当前URL作为心跳）"""
+        try:
+            client.browser_manager.driver.current_url
+            return True
+        except Exception:
+            return False
+    
+    async def acquire(self) -> XHSClient:
+        """
+        获取一个客户端，池中客户端都在使用时等待归还
+        
+        Returns:
+            XHSClient: 可用的客户端
+        """
+        await self._semaphore.acquire()
+        try:
+            try:
+                client = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                client = await asyncio.to_thread(XHSClient, self.config)
+                self.clients.append(client)
+                self._loops[client] = _ClientLoop(name=f"xhs-client-{len(self.clients)}")
+                logger.info(f"🧩 客户端池新建客户端 ({len(self.clients)}/{self.size})")
+                return client
+            
+            # 复用前检查浏览器状态，已失效的驱动先关闭，由任务重新创建
+            browser_manager = client.browser_manager
+            if browser_manager.is_initialized and not await asyncio.to_thread(self._is_browser_alive, client):
+                logger.warning("⚠️ 复用的浏览器已失效，将重新创建")
+                await asyncio.to_thread(browser_manager.close_driver)
+            return client
+        except BaseException:
+            self._semaphore.release()
+            raise
+    
+    async def run(self, client: XHSClient, coro) -> Any:
+        """
+        在客户端专用的事件循环中执行它的协程
+        
+        Args:
+            client: 通过acquire获取的客户端
+            coro: 该客户端的协程
+            
+        Returns:
+            Any: 协程的返回值
+        """
+        return await self._loops[client].run(coro)
+    
+    def release(self, client: XHSClient) -> None:
+        """归还客户端"""
+        self._idle.put_nowait(client)
+        self._semaphore.release()
+    
+    def discard(self, client: XHSClient) -> None:
+        """丢弃不可再复用的客户端并释放名额，之后按需新建客户端补充"""
+        if client in self.clients:
+            self.clients.remove(client)
+        client_loop = self._loops.pop(client, None)
+        if client_loop is not None:
+            client_loop.close()
+        self._semaphore.release()
+    
+    def is_exhausted(self) -> bool:
+        """池中客户端是否都在使用中（此时acquire需要排队等待）"""
+        return self._semaphore.locked()
+    
+    def has_open_browser(self) -> bool:
+        """池中是否有已启动的浏览器"""
+        return any(client.browser_manager.is_initialized for client in self.clients)
+    
+    def close_all(self) -> None:
+        """关闭池中所有客户端的浏览器（阻塞调用）"""
+        for client in self.clients:
+            client.browser_manager.close_driver()
+        for client_loop in self._loops.values():
+            client_loop.close()
+        self._loops.clear()
+
+
+class _SSEServer(uvicorn.Server):
+    """
+    运行SSE服务的uvicorn服务器
+    
+    停止信号由MCPServer在事件循环中统一处理（先等待发布任务、停止调度器和浏览器，再通知uvicorn退出），
+    因此禁用uvicorn自带的信号处理，避免其覆盖已注册的处理器，退出后也不会再重新抛出信号
+    """
+    
+    def install_signal_handlers(self) -> None:
+        """旧版uvicorn（<0.29）在启动时调用，这里不注册任何处理器"""
+    
+    @contextmanager
+    def capture_signals(self):
+        """新版uvicorn（>=0.29）在serve期间捕获信号，这里保持现有处理器不变"""
+        yield
 
 
 class MCPServer:
@@ -125,38 +826,100 @@ class MCPServer:
         self.xhs_client = XHSClient(config)
         self.mcp = FastMCP("小红书MCP服务器")
         self.task_manager = TaskManager()  # 添加任务管理器
+        # 发布任务使用的客户端池，默认大小为min(4, CPU核数)
+        pool_size = int(os.getenv('XHS_CLIENT_POOL_SIZE', str(min(4, os.cpu_count() or 1))))
+        self._client_pool = XHSClientPool(config, max(1, pool_size))
         self.scheduler_initialized = False  # 调度器初始化标志
         self.auth_server = create_smart_auth_server(config)  # 智能认证服务器
+        self._signal_handlers_installed = False  # 信号处理器只注册一次
+        self._serve_task: Optional[asyncio.Task] = None  # 运行SSE服务的任务
+        self._shutdown_task: Optional[asyncio.Task] = None  # 信号触发的清理任务
+        self._shutdown_event = asyncio.Event()  # 收到停止信号后置位，不再接受新的发布任务
+        self._uvicorn_server: Optional[_SSEServer] = None  # SSE模式下的uvicorn服务
+        # cookies文件是否存在的缓存：(检查时间, 是否存在)
+        self._cookies_cache: Tuple[float, bool] = (float('-inf'), False)
+        # 存储信息的缓存：(获取时间, 存储信息)
+        self._storage_info_cache: Tuple[float, Optional[Dict[str, Any]]] = (float('-inf'), None)
+        # 配置在启动后不再变化，预先生成快照供test_connection和xhs://config复用（只读视图，避免被意外修改）
+        self._config_snapshot = MappingProxyType(self.config.to_dict())
+        self._config_json = _dumps({**self._config_snapshot, "server_status": "running"})
         self._setup_tools()
         self._setup_resources()
         self._setup_prompts()
     
-    async def _initialize_data_collection(self) -> None:
-        """初始化数据采集功能"""
+    def _cookies_present(self, ttl: float = _COOKIES_CHECK_TTL) -> bool:
+        """
+        检查cookies文件是否存在（结果缓存ttl秒，避免批量发布时每个任务都访问文件系统）
+        
+        Args:
+            ttl: 缓存有效期（秒）
+            
+        Returns:
+            bool: cookies文件是否存在
+        """
+        now = time.monotonic()
+        checked_at, present = self._cookies_cache
+        if now - checked_at < ttl:
+            return present
+        present = os.path.exists(self.config.cookies_file)
+        self._cookies_cache = (now, present)
+        return present
+    
+    def _invalidate_cookies_cache(self) -> None:
+        """cookies文件可能发生变化时清除缓存"""
+        self._cookies_cache = (float('-inf'), False)
+    
+    async def _storage_info(self, ttl: float = _STORAGE_INFO_TTL) -> Dict[str, Any]:
+        """
+        获取存储信息（结果缓存ttl秒，避免每次连接测试都扫描数据目录）
+        
+        Args:
+            ttl: 缓存有效期（秒）
+            
+        Returns:
+            Dict[str, Any]: 存储信息
+        """
+        now = time.monotonic()
+        fetched_at, info = self._storage_info_cache
+        if info is not None and now - fetched_at < ttl:
+            return info
+        # 统计各存储的文件大小、记录数需要访问文件系统，放到工作线程执行
+        info = await asyncio.to_thread(storage_manager.get_storage_info)
+        self._storage_info_cache = (now, info)
+        return info
+    
+    async def _initialize_data_collection(self, cookie_count: Optional[int] = None) -> None:
+        """
+        初始化数据采集功能
+        
+        Args:
+            cookie_count: 启动阶段已统计的cookie数量，为None时在此重新统计
+        """
         if self.scheduler_initialized:
             return  # 已经初始化过了
             
         try:
-            import os
             logger.info("📊 初始化数据采集功能...")
             
-            # 检查cookies是否存在，数据采集需要登录状态
-            cookies = self.xhs_client.cookie_manager.load_cookies()
-            if not cookies:
+            # 检查cookies是否存在，数据采集需要登录状态（只计数不解析，采集时再加载）
+            if cookie_count is None:
+                cookie_count = self.xhs_client.cookie_manager.count_cookies()
+            if not cookie_count:
                 logger.warning("⚠️ 未找到cookies文件，跳过数据采集功能初始化")
                 logger.info("💡 数据采集需要登录状态，请先运行: python xhs_toolkit.py cookie save")
                 self.scheduler_initialized = False
                 return
             
-            logger.info(f"✅ 检测到 {len(cookies)} 个cookies，可以进行数据采集")
+            logger.info(f"✅ 检测到 {cookie_count} 个cookies，可以进行数据采集")
             
             # 初始化存储管理器
             storage_manager.initialize()
             storage_info = storage_manager.get_storage_info()
+            self._storage_info_cache = (time.monotonic(), storage_info)
             logger.info(f"💾 存储配置: {storage_info['storage_types']}")
             
             # 检查是否启用自动采集
-            enable_auto_collection = os.getenv('ENABLE_AUTO_COLLECTION', 'false').lower() == 'true'
+            enable_auto_collection = _auto_collection_enabled()
             
             if enable_auto_collection:
                 # 初始化调度器
@@ -183,13 +946,20 @@ class MCPServer:
             self.scheduler_initialized = True
             
         except Exception as e:
-            import traceback
-            logger.error(f"❌ 数据采集功能初始化失败: {e}")
-            logger.error(f"❌ 错误详情: {traceback.format_exc()}")
+            # 由日志系统按需格式化异常堆栈
+            logger.exception(f"❌ 数据采集功能初始化失败: {e}")
             self.scheduler_initialized = False
     
     def _setup_tools(self) -> None:
         """设置MCP工具"""
+        # 工具闭包中频繁使用的属性预先绑定为局部变量，调用时无需每次经self查找
+        task_manager = self.task_manager
+        spawn_publish = self._spawn_publish
+        cookies_present = self._cookies_present
+        cookie_manager = self.xhs_client.cookie_manager
+        auth_server = self.auth_server
+        config_snapshot = self._config_snapshot
+        shutdown_event = self._shutdown_event
         
         @self.mcp.tool()
         async def test_connection() -> str:
@@ -201,22 +971,21 @@ class MCPServer:
             """
             logger.info("🧪 收到连接测试请求")
             try:
-                import time
-                import os
-                current_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-                
-                # 检查配置
-                config_status = self.config.to_dict()
-                config_status["current_time"] = current_time
-                
-                # 添加数据采集状态
-                config_status["data_collection"] = {
-                    "scheduler_initialized": self.scheduler_initialized,
-                    "auto_collection_enabled": os.getenv('ENABLE_AUTO_COLLECTION', 'false').lower() == 'true',
-                    "storage_info": storage_manager.get_storage_info() if self.scheduler_initialized else None
+                current_time = _now_str()
+                storage_info = await self._storage_info() if self.scheduler_initialized else None
+                
+                # 检查配置（在缓存的只读快照上叠加本次请求的动态字段，包括数据采集状态）
+                config_status = {
+                    **config_snapshot,
+                    "current_time": current_time,
+                    "data_collection": {
+                        "scheduler_initialized": self.scheduler_initialized,
+                        "auto_collection_enabled": _auto_collection_enabled(),
+                        "storage_info": storage_info
+                    }
                 }
                 
-                logger.info(f"✅ 连接测试完成: {config_status}")
+                logger.info("✅ 连接测试完成: {}", config_status)
                 
                 result = {
                     "status": "success",
@@ -225,11 +994,11 @@ class MCPServer:
                     "timestamp": current_time
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except Exception as e:
                 error_msg = f"连接测试失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
+                logger.error("❌ {}", error_msg)
                 return error_msg
         
         @self.mcp.tool()
@@ -264,8 +1033,11 @@ class MCPServer:
                 )
                 
             """
-            logger.info(f"🚀 启动发布任务: 标题='{title}'")
-            logger.debug(f"📋 参数详情: images={images}, videos={videos}, topics={topics}")
+            logger.info("🚀 启动发布任务: 标题='{}'", title)
+            logger.debug("📋 参数详情: images={}, videos={}, topics={}", images, videos, topics)
+            
+            if shutdown_event.is_set():
+                return _error_json("服务器正在关闭，不再接受新的发布任务", "请在服务器重启后重试")
             
             try:
                 # 使用异步智能创建方法
@@ -278,15 +1050,17 @@ class MCPServer:
                     videos=videos
                 )
                 
-                # 记录解析结果
-                logger.info(f"✅ 智能解析结果: 图片{len(note.images) if note.images else 0}张, 视频{len(note.videos) if note.videos else 0}个, 话题{len(note.topics) if note.topics else 0}个")
+                # 解析结果只计算一次，日志和返回值共用
+                images = note.images or []
+                videos = note.videos or []
+                topics = note.topics or []
+                logger.info("✅ 智能解析结果: 图片{}张, 视频{}个, 话题{}个", len(images), len(videos), len(topics))
                 
                 # 创建异步任务
-                task_id = self.task_manager.create_task(note)
+                task_id = task_manager.create_task(note)
                 
                 # 启动后台任务
-                async_task = asyncio.create_task(self._execute_publish_task(task_id))
-                self.task_manager.running_tasks[task_id] = async_task
+                spawn_publish(task_id)
                 
                 result = {
                     "success": True,
@@ -294,46 +1068,48 @@ class MCPServer:
                     "message": f"发布任务已启动，任务ID: {task_id}",
                     "next_step": f"请使用 check_task_status('{task_id}') 查看进度",
                     "parsing_result": {
-                        "images_parsed": note.images if note.images else [],
-                        "videos_parsed": note.videos if note.videos else [],
-                        "topics_parsed": note.topics if note.topics else [],
-                        "images_count": len(note.images) if note.images else 0,
-                        "videos_count": len(note.videos) if note.videos else 0,
-                        "topics_count": len(note.topics) if note.topics else 0,
-                        "content_type": "图文" if note.images else "视频" if note.videos else "纯文本"
+                        "images_parsed": images,
+                        "videos_parsed": videos,
+                        "topics_parsed": topics,
+                        "images_count": len(images),
+                        "videos_count": len(videos),
+                        "topics_count": len(topics),
+                        "content_type": "图文" if images else "视频" if videos else "纯文本"
                     }
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except Exception as e:
                 error_msg = f"发布任务启动失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查输入格式，确保图片/视频路径正确或网络连接正常"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查输入格式，确保图片/视频路径正确或网络连接正常")
         
         @self.mcp.tool()
-        async def check_task_status(task_id: str) -> str:
+        async def check_task_status(task_id: str, wait_seconds: float = 0) -> str:
             """
             检查发布任务状态
             
             Args:
                 task_id (str): 任务ID
+                wait_seconds (float, optional): 任务未完成时最多等待多少秒，直到状态发生变化再返回（最长60秒），
+                    默认为0即立即返回。使用等待可以减少轮询次数
             
             Returns:
                 str: 任务状态信息
             """
-            logger.info(f"📊 检查任务状态: {task_id}")
+            logger.info("📊 检查任务状态: {}", task_id)
             
-            task = self.task_manager.get_task(task_id)
+            task = task_manager.get_task(task_id)
             if not task:
-                return json.dumps({
-                    "success": False,
-                    "message": f"任务 {task_id} 不存在"
-                }, ensure_ascii=False, indent=2)
+                return _error_json(f"任务 {task_id} 不存在")
+            
+            # 长轮询：等待下一次状态变化或超时
+            if wait_seconds > 0 and task.status not in ["completed", "failed"]:
+                try:
+                    await asyncio.wait_for(task._changed.wait(), min(wait_seconds, _MAX_STATUS_WAIT))
+                except asyncio.TimeoutError:
+                    pass
             
             # 计算运行时间
             elapsed_time = 0
@@ -354,7 +1130,7 @@ class MCPServer:
             if task.result:
                 result["result"] = task.result
             
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _dumps(result)
         
         @self.mcp.tool()
         async def get_task_result(task_id: str) -> str:
@@ -367,22 +1143,19 @@ class MCPServer:
             Returns:
                 str: 任务结果信息
             """
-            logger.info(f"📋 获取任务结果: {task_id}")
+            logger.info("📋 获取任务结果: {}", task_id)
             
-            task = self.task_manager.get_task(task_id)
+            task = task_manager.get_task(task_id)
             if not task:
-                return json.dumps({
-                    "success": False,
-                    "message": f"任务 {task_id} 不存在"
-                }, ensure_ascii=False, indent=2)
+                return _error_json(f"任务 {task_id} 不存在")
             
             if task.status not in ["completed", "failed"]:
-                return json.dumps({
+                return _dumps({
                     "success": False,
                     "message": f"任务 {task_id} 尚未完成，当前状态: {task.status}",
                     "current_status": task.status,
                     "progress": task.progress
-                }, ensure_ascii=False, indent=2)
+                })
             
             # 返回完整结果
             result = {
@@ -396,7 +1169,7 @@ class MCPServer:
             if task.result:
                 result["publish_result"] = task.result
             
-            return json.dumps(result, ensure_ascii=False, indent=2)
+            return _dumps(result)
         
         @self.mcp.tool()
         async def login_xiaohongshu(force_relogin: bool = False, quick_mode: bool = False) -> str:
@@ -412,24 +1185,25 @@ class MCPServer:
             Returns:
                 登录结果的JSON字符串
             """
-            logger.info(f"🚀 MCP工具调用：智能小红书 (force_relogin={force_relogin}, quick_mode={quick_mode})")
+            logger.info("🚀 MCP工具调用：智能小红书 (force_relogin={}, quick_mode={})", force_relogin, quick_mode)
             
             try:
                 # 如果是快速模式，先检查是否已有cookies
                 if quick_mode:
-                    cookies_file = Path(self.config.cookies_file)
-                    if cookies_file.exists():
+                    if cookies_present():
                         logger.info("⚡ 快速模式：发现已有cookies，跳过登录")
-                        return json.dumps({
+                        return _dumps({
                             "success": True,
                             "message": "✅ 快速模式：检测到已有cookies，跳过登录流程",
                             "action": "quick_skip",
                             "status": "valid",
                             "mode": "mcp_quick"
-                        }, ensure_ascii=False, indent=2)
+                        })
                 
                 # 使用MCP专用的智能模式
-                result = await self.auth_server.smart_login(interactive=False, mcp_mode=True)
+                result = await auth_server.smart_login(interactive=False, mcp_mode=True)
+                # 登录流程可能写入了新的cookies文件
+                self._invalidate_cookies_cache()
                 
                 # 格式化返回消息
                 if result.get("success", False):
@@ -443,63 +1217,60 @@ class MCPServer:
                 else:
                     message = f"❌ {result['message']}\n🔧 请检查浏览器或网络连接"
                 
-                logger.info(f"✅ MCP自动登录结果: {result.get('action', 'unknown')}")
-                return json.dumps({
+                logger.info("✅ MCP自动登录结果: {}", result.get('action', 'unknown'))
+                return _dumps({
                     "success": result.get("success", False),
                     "message": message,
                     "action": result.get("action", "unknown"),
                     "status": result.get("status", "unknown"),
                     "mode": "mcp_auto"
-                }, ensure_ascii=False, indent=2)
+                })
                 
             except Exception as e:
                 error_msg = f"MCP自动登录执行失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
+                logger.error("❌ {}", error_msg)
+                return _dumps({
                     "success": False,
                     "message": f"❌ {error_msg}",
                     "error": str(e),
                     "mode": "mcp_auto",
                     "suggestion": "可以尝试快速模式：login_xiaohongshu(quick_mode=True)"
-                }, ensure_ascii=False, indent=2)
+                })
         
         @self.mcp.tool()
-        async def get_creator_data_analysis() -> str:
+        async def get_creator_data_analysis(limit: int = 100) -> str:
             """
             获取创作者数据用于分析
             
+            Args:
+                limit (int, optional): 每类数据返回的最新记录数，默认100
+            
             Returns:
                 str: 包含所有创作者数据的详细信息用于数据分析
             """
-            logger.info("📊 获取创作者数据用于分析")
+            logger.info("📊 获取创作者数据用于分析 (每类最多 {} 条)", limit)
             
             try:
+                limit = max(1, int(limit))
+                
                 # 检查cookies是否存在，数据分析需要登录状态
-                cookies = self.xhs_client.cookie_manager.load_cookies()
-                if not cookies:
-                    return json.dumps({
-                        "success": False,
-                        "message": "数据分析需要登录状态，未找到cookies文件",
-                        "suggestion": "请先运行: python xhs_toolkit.py cookie save"
-                    }, ensure_ascii=False, indent=2)
+                cookie_count = await asyncio.to_thread(cookie_manager.count_cookies)
+                if not cookie_count:
+                    return _error_json("数据分析需要登录状态，未找到cookies文件", "请先运行: python xhs_toolkit.py cookie save")
                 
                 if not self.scheduler_initialized:
-                    return json.dumps({
-                        "success": False,
-                        "message": "数据采集功能未初始化，可能因为cookies问题",
-                        "suggestion": "请检查cookies状态并重启服务器"
-                    }, ensure_ascii=False, indent=2)
+                    return _error_json("数据采集功能未初始化，可能因为cookies问题", "请检查cookies状态并重启服务器")
                 
                 # 获取存储管理器
                 csv_storage = storage_manager.get_csv_storage()
                 
-                # 读取所有数据
-                dashboard_data = await csv_storage.get_latest_data('dashboard', limit=100)
-                content_data = await csv_storage.get_latest_data('content_analysis', limit=100)
-                fans_data = await csv_storage.get_latest_data('fans', limit=100)
-                
-                # 获取存储信息
-                storage_info = storage_manager.get_storage_info()
+                # 三类数据及存储信息互不依赖，在工作线程中并发读取
+                dashboard_data, content_data, fans_data, storage_info = await asyncio.gather(
+                    asyncio.to_thread(csv_storage.read_latest_data, 'dashboard', limit),
+                    asyncio.to_thread(csv_storage.read_latest_data, 'content_analysis', limit),
+                    asyncio.to_thread(csv_storage.read_latest_data, 'fans', limit),
+                    self._storage_info()
+                )
                 
                 result = {
                     "success": True,
@@ -518,18 +1289,15 @@ class MCPServer:
                         "content": "内容分析数据包含每篇笔记的详细表现",
                         "fans": "粉丝数据包含粉丝增长趋势"
                     },
-                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                    "timestamp": _now_str()
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except Exception as e:
                 error_msg = f"获取创作者数据失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg)
         
         @self.mcp.tool()
         async def publish_from_json(json_data: str, title: str = None) -> str:
@@ -567,29 +1335,27 @@ class MCPServer:
             """
             logger.info("📝 开始处理JSON数据发布")
             
+            if shutdown_event.is_set():
+                return _error_json("服务器正在关闭，不再接受新的发布任务", "请在服务器重启后重试")
+            
             try:
                 # 解析JSON字符串
-                data = json.loads(json_data)
-                logger.info(f"✅ 成功解析JSON数据，包含字段: {list(data.keys())}")
+                data = _loads(json_data)
+                logger.info("✅ 成功解析JSON数据，包含字段: {}", list(data.keys()))
                 
                 # 验证必需字段
                 required_fields = ['wenan']
                 missing_fields = [field for field in required_fields if field not in data]
                 if missing_fields:
-                    return json.dumps({
-                        "success": False,
-                        "message": f"缺少必需字段: {missing_fields}",
-                        "suggestion": "请确保JSON包含文案内容"
-                    }, ensure_ascii=False, indent=2)
+                    return _error_json(f"缺少必需字段: {missing_fields}", "请确保JSON包含文案内容")
                 
                 # 提取数据
                 original_content = data['wenan']
                 
                 # 从文案内容中提取话题标签并清理内容
-                from ..utils.text_utils import extract_and_clean_topics_from_content
                 cleaned_content, extracted_topics = extract_and_clean_topics_from_content(original_content)
-                logger.info(f"🏷️ 从文案中提取到话题: {extracted_topics}")
-                logger.info(f"📝 清理后的文案长度: {len(cleaned_content)} 字符")
+                logger.info("🏷️ 从文案中提取到话题: {}", extracted_topics)
+                logger.info("📝 清理后的文案长度: {} 字符", len(cleaned_content))
                 
                 # 使用清理后的内容
                 content = cleaned_content
@@ -608,8 +1374,8 @@ class MCPServer:
                     if isinstance(data['topics'], list):
                         json_topics = [str(topic).strip() for topic in data['topics'] if str(topic).strip()]
                     elif isinstance(data['topics'], str):
-                        json_topics = [topic.strip() for topic in data['topics'].split(',') if topic.strip()]
-                    logger.info(f"🏷️ 从JSON中获取到话题: {json_topics}")
+                        json_topics = parse_topics_string(data['topics'])
+                    logger.info("🏷️ 从JSON中获取到话题: {}", json_topics)
                 
                 # 合并话题（优先使用JSON中的话题，然后添加从文案中提取的话题）
                 final_topics = []
@@ -627,7 +1393,7 @@ class MCPServer:
                         final_topics.append(topic)
                         seen_topics.add(topic)
                 
-                logger.info(f"🏷️ 最终话题列表: {final_topics}")
+                logger.info("🏷️ 最终话题列表: {}", final_topics)
                 
                 # 处理图片
                 images = []
@@ -635,12 +1401,12 @@ class MCPServer:
                 # 添加封面图片（如果有）
                 if 'fengmian' in data and data['fengmian']:
                     images.append(data['fengmian'])
-                    logger.info(f"📸 添加封面图片: {data['fengmian']}")
+                    logger.info("📸 添加封面图片: {}", data['fengmian'])
                 
                 # 添加封面后图片（如果有）- 新增支持
                 if 'fengmian_pic' in data and data['fengmian_pic']:
                     images.append(data['fengmian_pic'])
-                    logger.info(f"📸 添加封面后图片: {data['fengmian_pic']}")
+                    logger.info("📸 添加封面后图片: {}", data['fengmian_pic'])
                 
                 # 添加内容图片
                 if 'neirongtu' in data and data['neirongtu']:
@@ -648,34 +1414,32 @@ class MCPServer:
                         images.extend(data['neirongtu'])
                     else:
                         images.append(data['neirongtu'])
-                    logger.info(f"📸 添加内容图片: {len(data['neirongtu']) if isinstance(data['neirongtu'], list) else 1}张")
+                    logger.info("📸 添加内容图片: {}张", len(data['neirongtu']) if isinstance(data['neirongtu'], list) else 1)
                 
                 # 添加总结图片（如果有）
                 if 'zongjie' in data and data['zongjie']:
                     images.append(data['zongjie'])
-                    logger.info(f"📸 添加总结图片: {data['zongjie']}")
+                    logger.info("📸 添加总结图片: {}", data['zongjie'])
                 
                 # 添加结尾图片（如果有）
                 if 'jiewei' in data and data['jiewei']:
                     images.append(data['jiewei'])
-                    logger.info(f"📸 添加结尾图片: {data['jiewei']}")
+                    logger.info("📸 添加结尾图片: {}", data['jiewei'])
                 
                 # 限制图片数量（小红书最多9张）
                 if len(images) > 9:
-                    logger.warning(f"⚠️ 图片数量超过限制({len(images)}张)，将只使用前9张")
+                    logger.warning("⚠️ 图片数量超过限制({}张)，将只使用前9张", len(images))
                     images = images[:9]
                 
-                logger.info(f"📋 解析结果: 标题='{title}', 图片{len(images)}张, 文案长度{len(content)}字符, 话题{len(final_topics)}个")
+                logger.info("📋 解析结果: 标题='{}', 图片{}张, 文案长度{}字符, 话题{}个", title, len(images), len(content), len(final_topics))
                 
                 # 获取cookies用于图片下载
                 cookies = None
                 try:
-                    from ..auth.cookie_manager import CookieManager
-                    cookie_manager = CookieManager(self.config)
-                    cookies = cookie_manager.load_cookies()
-                    logger.debug(f"🍪 获取到 {len(cookies)} 个cookies用于图片下载")
+                    cookies = await asyncio.to_thread(cookie_manager.load_cookies)
+                    logger.debug("🍪 获取到 {} 个cookies用于图片下载", len(cookies))
                 except Exception as e:
-                    logger.warning(f"⚠️ 获取cookies失败: {e}，图片下载可能受影响")
+                    logger.warning("⚠️ 获取cookies失败: {}，图片下载可能受影响", e)
                 
                 # 使用现有的智能发布功能
                 note = await XHSNote.async_smart_create(
@@ -687,11 +1451,10 @@ class MCPServer:
                 )
                 
                 # 创建异步任务
-                task_id = self.task_manager.create_task(note)
+                task_id = task_manager.create_task(note)
                 
                 # 启动后台任务
-                async_task = asyncio.create_task(self._execute_publish_task(task_id))
-                self.task_manager.running_tasks[task_id] = async_task
+                spawn_publish(task_id)
                 
                 result = {
                     "success": True,
@@ -711,25 +1474,17 @@ class MCPServer:
                     }
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except json.JSONDecodeError as e:
                 error_msg = f"JSON解析失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON格式是否正确")
                 
             except Exception as e:
                 error_msg = f"处理JSON数据失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON内容和格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON内容和格式是否正确")
         
         @self.mcp.tool()
         async def batch_publish_from_json(json_data: str, max_items: int = 5) -> str:
@@ -767,11 +1522,14 @@ class MCPServer:
             
             图片排序：fengmian → fengmian_pic → neirongtu → zongjie → jiewei
             """
-            logger.info(f"📝 开始批量处理JSON数据，最大条目数: {max_items}")
+            logger.info("📝 开始批量处理JSON数据，最大条目数: {}", max_items)
+            
+            if shutdown_event.is_set():
+                return _error_json("服务器正在关闭，不再接受新的发布任务", "请在服务器重启后重试")
             
             try:
                 # 解析JSON字符串
-                data = json.loads(json_data)
+                data = _loads(json_data)
                 
                 # 判断是单个条目还是多个条目
                 if isinstance(data, dict):
@@ -781,137 +1539,142 @@ class MCPServer:
                     # 多个条目
                     items = data
                 else:
-                    return json.dumps({
-                        "success": False,
-                        "message": "JSON格式错误：必须是JSON对象或数组",
-                        "suggestion": "请检查JSON格式"
-                    }, ensure_ascii=False, indent=2)
+                    return _error_json("JSON格式错误：必须是JSON对象或数组", "请检查JSON格式")
                 
-                logger.info(f"✅ 成功解析JSON数据，包含 {len(items)} 个条目")
+                logger.info("✅ 成功解析JSON数据，包含 {} 个条目", len(items))
                 
                 # 限制处理数量
                 if len(items) > max_items:
-                    logger.warning(f"⚠️ 条目数量({len(items)})超过限制({max_items})，将只处理前{max_items}个")
+                    logger.warning("⚠️ 条目数量({})超过限制({})，将只处理前{}个", len(items), max_items, max_items)
                     items = items[:max_items]
                 
-                # 批量处理
-                task_ids = []
-                success_count = 0
-                failed_count = 0
+                # 获取cookies用于图片下载（所有条目共用，只读取一次）
+                cookies = None
+                try:
+                    cookies = await asyncio.to_thread(cookie_manager.load_cookies)
+                except Exception as e:
+                    logger.warning("⚠️ 获取cookies失败: {}", e)
                 
-                for idx, item in enumerate(items):
-                    try:
-                        logger.info(f"📝 处理第 {idx+1}/{len(items)} 个条目")
-                        
-                        # 验证必需字段
-                        if 'wenan' not in item:
-                            logger.warning(f"⚠️ 第 {idx+1} 个条目缺少文案字段，跳过")
-                            failed_count += 1
-                            continue
-                        
-                        # 提取数据
-                        original_content = item['wenan']
-                        
-                        # 从文案内容中提取话题标签并清理内容
-                        from ..utils.text_utils import extract_and_clean_topics_from_content
-                        cleaned_content, extracted_topics = extract_and_clean_topics_from_content(original_content)
-                        
-                        # 使用清理后的内容
-                        content = cleaned_content
-                        
-                        # 从清理后的文案中提取标题
-                        lines = content.split('\n')
-                        title = lines[0].strip()
-                        if len(title) > 50:
-                            title = title[:47] + "..."
-                        
-                        # 也支持从JSON中直接提供话题字段
-                        json_topics = []
-                        if 'topics' in item and item['topics']:
-                            if isinstance(item['topics'], list):
-                                json_topics = [str(topic).strip() for topic in item['topics'] if str(topic).strip()]
-                            elif isinstance(item['topics'], str):
-                                json_topics = [topic.strip() for topic in item['topics'].split(',') if topic.strip()]
-                        
-                        # 合并话题
-                        final_topics = []
-                        seen_topics = set()
-                        
-                        # 先添加JSON中的话题
-                        for topic in json_topics:
-                            if topic not in seen_topics:
-                                final_topics.append(topic)
-                                seen_topics.add(topic)
-                        
-                        # 再添加从文案中提取的话题
-                        for topic in extracted_topics:
-                            if topic not in seen_topics:
-                                final_topics.append(topic)
-                                seen_topics.add(topic)
-                        
-                        # 处理图片
-                        images = []
-                        
-                        # 添加封面图片（如果有）
-                        if 'fengmian' in item and item['fengmian']:
-                            images.append(item['fengmian'])
-                        
-                        # 添加封面后图片（如果有）- 新增支持
-                        if 'fengmian_pic' in item and item['fengmian_pic']:
-                            images.append(item['fengmian_pic'])
-                        
-                        # 添加内容图片
-                        if 'neirongtu' in item and item['neirongtu']:
-                            if isinstance(item['neirongtu'], list):
-                                images.extend(item['neirongtu'])
-                            else:
-                                images.append(item['neirongtu'])
-                        
-                        # 添加总结图片（如果有）
-                        if 'zongjie' in item and item['zongjie']:
-                            images.append(item['zongjie'])
-                        
-                        # 添加结尾图片（如果有）
-                        if 'jiewei' in item and item['jiewei']:
-                            images.append(item['jiewei'])
-                        
-                        # 限制图片数量
-                        if len(images) > 9:
-                            images = images[:9]
-                        
-                        # 获取cookies用于图片下载
-                        cookies = None
-                        try:
-                            from ..auth.cookie_manager import CookieManager
-                            cookie_manager = CookieManager(self.config)
-                            cookies = cookie_manager.load_cookies()
-                        except Exception as e:
-                            logger.warning(f"⚠️ 获取cookies失败: {e}")
-                        
-                        # 创建笔记
-                        note = await XHSNote.async_smart_create(
+                # 准备阶段（解析文案、下载图片）各条目互不依赖，并发执行；
+                # 每个条目的图片下载都会启动浏览器，因此限制同时准备的条目数
+                prepare_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PREPARE)
+                
+                async def prepare_item(idx: int, item: Dict[str, Any]) -> Optional[XHSNote]:
+                    """解析单个条目并创建笔记，缺少文案字段时返回None"""
+                    logger.info("📝 处理第 {}/{} 个条目", idx+1, len(items))
+                    
+                    # 验证必需字段
+                    if 'wenan' not in item:
+                        logger.warning("⚠️ 第 {} 个条目缺少文案字段，跳过", idx+1)
+                        return None
+                    
+                    # 提取数据
+                    original_content = item['wenan']
+                    
+                    # 从文案内容中提取话题标签并清理内容
+                    cleaned_content, extracted_topics = extract_and_clean_topics_from_content(original_content)
+                    
+                    # 使用清理后的内容
+                    content = cleaned_content
+                    
+                    # 从清理后的文案中提取标题
+                    lines = content.split('\n')
+                    title = lines[0].strip()
+                    if len(title) > 50:
+                        title = title[:47] + "..."
+                    
+                    # 也支持从JSON中直接提供话题字段
+                    json_topics = []
+                    if 'topics' in item and item['topics']:
+                        if isinstance(item['topics'], list):
+                            json_topics = [str(topic).strip() for topic in item['topics'] if str(topic).strip()]
+                        elif isinstance(item['topics'], str):
+                            json_topics = parse_topics_string(item['topics'])
+                    
+                    # 合并话题
+                    final_topics = []
+                    seen_topics = set()
+                    
+                    # 先添加JSON中的话题
+                    for topic in json_topics:
+                        if topic not in seen_topics:
+                            final_topics.append(topic)
+                            seen_topics.add(topic)
+                    
+                    # 再添加从文案中提取的话题
+                    for topic in extracted_topics:
+                        if topic not in seen_topics:
+                            final_topics.append(topic)
+                            seen_topics.add(topic)
+                    
+                    # 处理图片
+                    images = []
+                    
+                    # 添加封面图片（如果有）
+                    if 'fengmian' in item and item['fengmian']:
+                        images.append(item['fengmian'])
+                    
+                    # 添加封面后图片（如果有）- 新增支持
+                    if 'fengmian_pic' in item and item['fengmian_pic']:
+                        images.append(item['fengmian_pic'])
+                    
+                    # 添加内容图片
+                    if 'neirongtu' in item and item['neirongtu']:
+                        if isinstance(item['neirongtu'], list):
+                            images.extend(item['neirongtu'])
+                        else:
+                            images.append(item['neirongtu'])
+                    
+                    # 添加总结图片（如果有）
+                    if 'zongjie' in item and item['zongjie']:
+                        images.append(item['zongjie'])
+                    
+                    # 添加结尾图片（如果有）
+                    if 'jiewei' in item and item['jiewei']:
+                        images.append(item['jiewei'])
+                    
+                    # 限制图片数量
+                    if len(images) > 9:
+                        images = images[:9]
+                    
+                    # 创建笔记
+                    async with prepare_semaphore:
+                        return await XHSNote.async_smart_create(
                             title=title,
                             content=content,
                             images=images if images else None,
                             topics=final_topics if final_topics else None,
                             cookies=cookies
                         )
-                        
-                        # 创建任务
-                        task_id = self.task_manager.create_task(note)
-                        task_ids.append(task_id)
-                        
-                        # 启动后台任务
-                        async_task = asyncio.create_task(self._execute_publish_task(task_id))
-                        self.task_manager.running_tasks[task_id] = async_task
-                        
-                        success_count += 1
-                        logger.info(f"✅ 第 {idx+1} 个条目处理成功，任务ID: {task_id}")
-                        
-                    except Exception as e:
-                        logger.error(f"❌ 第 {idx+1} 个条目处理失败: {str(e)}")
+                
+                prepared = await asyncio.gather(
+                    *(prepare_item(idx, item) for idx, item in enumerate(items)),
+                    return_exceptions=True
+                )
+                
+                # 按原顺序创建并启动发布任务
+                task_ids = []
+                success_count = 0
+                failed_count = 0
+                
+                for idx, note in enumerate(prepared):
+                    if note is None:
                         failed_count += 1
                         continue
+                    if isinstance(note, BaseException):
+                        logger.error("❌ 第 {} 个条目处理失败: {}", idx+1, note)
+                        failed_count += 1
+                        continue
+                    
+                    # 创建任务
+                    task_id = task_manager.create_task(note)
+                    task_ids.append(task_id)
+                    
+                    # 启动后台任务
+                    spawn_publish(task_id)
+                    
+                    success_count += 1
+                    logger.info("✅ 第 {} 个条目处理成功，任务ID: {}", idx+1, task_id)
                 
                 result = {
                     "success": True,
@@ -926,25 +1689,17 @@ class MCPServer:
                     "next_step": f"请使用 check_task_status('{task_ids[0]}') 查看第一个任务进度" if task_ids else "没有成功创建的任务"
                 }
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except json.JSONDecodeError as e:
                 error_msg = f"JSON解析失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON格式是否正确")
                 
             except Exception as e:
                 error_msg = f"批量处理JSON数据失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON内容和格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON内容和格式是否正确")
         
         @self.mcp.tool()
         async def preview_json_data(json_data: str) -> str:
@@ -964,7 +1719,7 @@ class MCPServer:
             
             try:
                 # 解析JSON字符串
-                data = json.loads(json_data)
+                data = _loads(json_data)
                 
                 # 判断是单个条目还是多个条目
                 if isinstance(data, dict):
@@ -974,13 +1729,9 @@ class MCPServer:
                     items = data
                     is_batch = True
                 else:
-                    return json.dumps({
-                        "success": False,
-                        "message": "JSON格式错误：必须是JSON对象或数组",
-                        "suggestion": "请检查JSON格式"
-                    }, ensure_ascii=False, indent=2)
+                    return _error_json("JSON格式错误：必须是JSON对象或数组", "请检查JSON格式")
                 
-                logger.info(f"✅ 成功解析JSON数据，包含 {len(items)} 个条目")
+                logger.info("✅ 成功解析JSON数据，包含 {} 个条目", len(items))
                 
                 # 分析每个条目
                 preview_items = []
@@ -1106,25 +1857,148 @@ class MCPServer:
                 else:
                     result["recommendations"].append(f"可以发布 {len(valid_items)} 个条目")
                 
-                return json.dumps(result, ensure_ascii=False, indent=2)
+                return _dumps(result)
                 
             except json.JSONDecodeError as e:
                 error_msg = f"JSON解析失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON格式是否正确")
                 
             except Exception as e:
                 error_msg = f"预览JSON数据失败: {str(e)}"
-                logger.error(f"❌ {error_msg}")
-                return json.dumps({
-                    "success": False,
-                    "message": error_msg,
-                    "suggestion": "请检查JSON内容和格式是否正确"
-                }, ensure_ascii=False, indent=2)
+                logger.error("❌ {}", error_msg)
+                return _error_json(error_msg, "请检查JSON内容和格式是否正确")
+        
+        # 可被batch_execute调用的工具（新版FastMCP的装饰器返回工具对象，原函数在fn属性上）
+        batch_tools = {
+            name: getattr(tool, 'fn', tool) for name, tool in (
+                ("test_connection", test_connection),
+                ("smart_publish_note", smart_publish_note),
+                ("check_task_status", check_task_status),
+                ("get_task_result", get_task_result),
+                ("login_xiaohongshu", login_xiaohongshu),
+                ("get_creator_data_analysis", get_creator_data_analysis),
+                ("publish_from_json", publish_from_json),
+                ("batch_publish_from_json", batch_publish_from_json),
+                ("preview_json_data", preview_json_data)
+            )
+        }
+        
+        @self.mcp.tool()
+        async def batch_execute(calls: List[Dict[str, Any]], max_concurrent: int = 4,
+                                stop_on_error: bool = False, timeout_ms: int = 30000) -> str:
+            """
+            在一次调用中批量执行多个工具
+            
+            互不依赖的调用并发执行；通过input_from可以把前面调用的结果作为后面调用的参数，
+            有依赖关系的调用会按依赖顺序分层执行。
+            
+            Args:
+                calls: 调用列表，每项格式为：
+                       {"id": "调用ID（可选，默认为序号）", "tool": "工具名", "args": {参数},
+                        "input_from": {"参数名": "被依赖调用的ID"}}
+                max_concurrent: 最大并发数
+                stop_on_error: 出错后是否跳过后续层的调用
+                timeout_ms: 单个调用的超时时间（毫秒）
+            
+            Returns:
+                str: 每个调用的执行结果
+                
+            示例:
+                batch_execute(calls=[
+                    {"id": "login", "tool": "login_xiaohongshu", "args": {"quick_mode": true}},
+                    {"id": "preview", "tool": "preview_json_data", "args": {"json_data": "{...}"}}
+                ])
+            """
+            logger.info("📦 批量执行 {} 个工具调用", len(calls))
+            
+            try:
+                call_ids, layers = _plan_batch_layers(calls, batch_tools)
+            except ValueError as e:
+                return _error_json(f"批量调用参数错误: {e}", "请检查tool、id和input_from字段")
+            
+            semaphore = asyncio.Semaphore(max(1, max_concurrent))
+            timeout = max(timeout_ms, 1) / 1000
+            outputs: Dict[str, Any] = {}
+            results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+            
+            async def run_call(index: int) -> None:
+                call = calls[index]
+                call_id = call_ids[index]
+                args = dict(call.get("args") or {})
+                for param, source_id in (call.get("input_from") or {}).items():
+                    args[param] = outputs.get(source_id)
+                
+                async with semaphore:
+                    try:
+                        raw = await asyncio.wait_for(batch_tools[call["tool"]](**args), timeout)
+                    except asyncio.TimeoutError:
+                        results[index] = {"id": call_id, "ok": False, "error": f"调用超时（{timeout_ms}ms）"}
+                        return
+                    except Exception as e:
+                        results[index] = {"id": call_id, "ok": False, "error": str(e)}
+                        return
+                
+                # 工具返回JSON字符串，解析后再嵌入结果，避免二次转义
+                try:
+                    value = _loads(raw)
+                except (TypeError, ValueError):
+                    value = raw
+                outputs[call_id] = value
+                ok = not (isinstance(value, dict) and (value.get("success") is False or value.get("status") == "error"))
+                results[index] = {"id": call_id, "ok": ok, "result": value}
+            
+            failed = False
+            for layer in layers:
+                if failed and stop_on_error:
+                    for index in layer:
+                        results[index] = {"id": call_ids[index], "ok": False, "error": "前序调用失败，已跳过"}
+                    continue
+                await asyncio.gather(*(run_call(index) for index in layer))
+                failed = failed or any(not results[index]["ok"] for index in layer)
+            
+            success_count = sum(1 for item in results if item["ok"])
+            return _dumps({
+                "success": success_count == len(calls),
+                "message": f"批量执行完成，成功 {success_count} 个，失败 {len(calls) - success_count} 个",
+                "results": results
+            })
+    
+    def _spawn_publish(self, task_id: str) -> asyncio.Task:
+        """
+        启动后台发布任务，并登记到running_tasks
+        
+        任务结束时由完成回调移除登记并检查结果，关闭服务时统一取消并等待
+        
+        Args:
+            task_id: 任务ID
+            
+        Returns:
+            asyncio.Task: 后台任务
+        """
+        async_task = asyncio.create_task(self._execute_publish_task(task_id), name=f"publish-{task_id}")
+        self.task_manager.running_tasks[task_id] = async_task
+        async_task.add_done_callback(partial(self._on_publish_done, task_id))
+        return async_task
+    
+    def _on_publish_done(self, task_id: str, async_task: asyncio.Task) -> None:
+        """后台发布任务结束回调：移除登记，并把取消或未捕获的异常记录到任务状态"""
+        self.task_manager.running_tasks.pop(task_id, None)
+        
+        task = self.task_manager.get_task(task_id)
+        if async_task.cancelled():
+            if task and task.status not in ["completed", "failed"]:
+                self.task_manager.update_task(task_id, status="failed", message="任务已取消",
+                                              result={"success": False, "message": "任务已取消"})
+            return
+        
+        error = async_task.exception()
+        if error is not None:
+            logger.opt(exception=error).error(f"❌ 后台任务 {task_id} 异常退出: {error}")
+            if task and task.status not in ["completed", "failed"]:
+                error_msg = f"任务执行失败: {error}"
+                self.task_manager.update_task(task_id, status="failed", progress=0, message=error_msg,
+                                              result={"success": False, "message": error_msg})
     
     async def _execute_publish_task(self, task_id: str) -> None:
         """
@@ -1138,6 +2012,7 @@ class MCPServer:
             logger.error(f"❌ 任务 {task_id} 不存在")
             return
         
+        client = None
         try:
             logger.info(f"🚀 开始执行任务 {task_id}: {task.note.title}")
             
@@ -1147,8 +2022,7 @@ class MCPServer:
             
             try:
                 # 只检查cookies文件是否存在，避免重复的详细验证
-                cookies_file = Path(self.config.cookies_file)
-                if not cookies_file.exists():
+                if not self._cookies_present():
                     error_msg = "❌ 未找到登录cookies，请先登录小红书"
                     logger.error(f"任务 {task_id}: {error_msg}")
                     self.task_manager.update_task(
@@ -1190,30 +2064,38 @@ class MCPServer:
             logger.info(f"📋 任务 {task_id} - 阶段1: 初始化浏览器")
             self.task_manager.update_task(task_id, status="initializing", progress=15, message="正在初始化浏览器驱动...")
             
-            # 创建新的客户端实例，避免并发冲突
-            client = XHSClient(self.config)
-            logger.info(f"✅ 任务 {task_id} - 浏览器客户端创建成功")
+            # 从客户端池获取客户端，每个客户端同一时间只服务一个任务，避免并发冲突；
+            # 池大小即同时发布的上限，超出的任务在此排队，只占用一个协程而不会启动新的浏览器
+            if self._client_pool.is_exhausted():
+                logger.info(f"⏳ 任务 {task_id} - 浏览器均在使用中，排队等待")
+                self.task_manager.update_task(task_id, status="queued", progress=15, message="发布任务较多，正在排队等待空闲浏览器...")
+            client = await self._client_pool.acquire()
+            logger.info(f"✅ 任务 {task_id} - 浏览器客户端获取成功")
             
             # 阶段2：启动浏览器并访问发布页面
             logger.info(f"📋 任务 {task_id} - 阶段2: 启动浏览器")
             self.task_manager.update_task(task_id, status="browser_starting", progress=20, message="正在启动浏览器...")
             
             try:
-                # 创建浏览器驱动
-                driver = client.browser_manager.create_driver()
-                logger.info(f"✅ 任务 {task_id} - 浏览器驱动创建成功")
+                # 复用池中已启动的浏览器，没有时再创建（Selenium调用是阻塞的，放到线程中执行，避免阻塞事件循环）
+                if client.browser_manager.is_initialized:
+                    driver = client.browser_manager.driver
+                    logger.info(f"✅ 任务 {task_id} - 复用已启动的浏览器")
+                else:
+                    driver = await asyncio.to_thread(client.browser_manager.create_driver)
+                    logger.info(f"✅ 任务 {task_id} - 浏览器驱动创建成功")
                 
                 # 导航到创作者中心
                 logger.info(f"📋 任务 {task_id} - 导航到创作者中心")
                 self.task_manager.update_task(task_id, status="navigating", progress=25, message="正在导航到小红书创作者中心...")
-                client.browser_manager.navigate_to_creator_center()
+                await asyncio.to_thread(client.browser_manager.navigate_to_creator_center)
                 logger.info(f"✅ 任务 {task_id} - 导航成功")
                 
                 # 加载cookies
                 logger.info(f"📋 任务 {task_id} - 加载cookies")
                 self.task_manager.update_task(task_id, status="loading_cookies", progress=30, message="正在加载登录状态...")
-                cookies = client.cookie_manager.load_cookies()
-                cookie_result = client.browser_manager.load_cookies(cookies)
+                cookies = await asyncio.to_thread(client.cookie_manager.load_cookies)
+                cookie_result = await asyncio.to_thread(client.browser_manager.load_cookies, cookies)
                 logger.info(f"✅ 任务 {task_id} - Cookies加载结果: {cookie_result}")
                 
             except Exception as e:
@@ -1239,16 +2121,18 @@ class MCPServer:
             
             try:
                 # 访问发布页面
-                driver.get("https://creator.xiaohongshu.com/publish/publish?from=menu")
+                await asyncio.to_thread(driver.get, "https://creator.xiaohongshu.com/publish/publish?from=menu")
                 logger.info(f"✅ 任务 {task_id} - 发布页面访问成功")
                 await asyncio.sleep(5)  # 等待页面基本加载
                 
-                if "publish" not in driver.current_url:
+                # 读取current_url也是一次WebDriver请求，同样放到线程中执行
+                current_url = await asyncio.to_thread(getattr, driver, 'current_url')
+                if "publish" not in current_url:
                     error_msg = "无法访问发布页面，可能需要重新登录"
                     logger.error(f"任务 {task_id}: {error_msg}")
                     raise Exception(error_msg)
                 
-                logger.info(f"✅ 任务 {task_id} - 页面URL验证通过: {driver.current_url}")
+                logger.info(f"✅ 任务 {task_id} - 页面URL验证通过: {current_url}")
                 
             except Exception as e:
                 error_msg = f"❌ 访问发布页面失败: {str(e)}"
@@ -1278,10 +2162,10 @@ class MCPServer:
                 
                 if has_images:
                     logger.info(f"📋 任务 {task_id} - 切换到图文发布模式")
-                    await client._switch_publish_mode(task.note)
+                    await self._client_pool.run(client, client._switch_publish_mode(task.note))
                 elif has_videos:
                     logger.info(f"📋 任务 {task_id} - 切换到视频发布模式")
-                    await client._switch_publish_mode(task.note)
+                    await self._client_pool.run(client, client._switch_publish_mode(task.note))
                 else:
                     logger.info(f"📋 任务 {task_id} - 纯文本发布模式")
                 
@@ -1296,238 +2180,135 @@ class MCPServer:
                 self.task_manager.update_task(task_id, status="uploading", progress=50, message="正在上传文件...")
                 
                 try:
-                    await client._handle_file_upload(task.note)
+                    await self._client_pool.run(client, client._handle_file_upload(task.note))
                     logger.info(f"✅ 任务 {task_id} - 文件上传处理完成")
                     
                     # 等待上传完成
                     if task.note.videos:
                         logger.info(f"📋 任务 {task_id} - 等待视频上传完成")
                         self.task_manager.update_task(task_id, status="waiting_upload", progress=60, message="正在等待视频上传完成...")
-                        await client._wait_for_video_upload_complete()
+                        await self._client_pool.run(client, client._wait_for_video_upload_complete())
                     else:
-                        logger.info(f"📋 任务 {task_id} - 等待图片上传完成")
-                        self.task_manager.update_task(task_id, status="waiting_upload", progress=60, message="正在等待图片上传完成...")
-                        await asyncio.sleep(3)
-                    
-                    logger.info(f"✅ 任务 {task_id} - 文件上传完成")
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ 任务 {task_id} - 文件上传警告: {e}，继续执行...")
-            
-            # 阶段6：填写笔记内容
-            logger.info(f"📋 任务 {task_id} - 阶段6: 填写笔记内容")
-            self.task_manager.update_task(task_id, status="filling_content", progress=70, message="正在填写笔记内容...")
-            
-            try:
-                await client._fill_note_content(task.note)
-                logger.info(f"✅ 任务 {task_id} - 内容填写完成")
-                
-            except Exception as e:
-                error_msg = f"❌ 填写内容失败: {str(e)}"
-                logger.error(f"任务 {task_id}: {error_msg}")
-                self.task_manager.update_task(
-                    task_id, 
-                    status="failed", 
-                    progress=0, 
-                    message=error_msg,
-                    result={
-                        "success": False,
-                        "error_type": "content_fill_error",
-                        "error": str(e),
-                        "suggested_action": "请检查内容格式"
-                    }
-                )
-                return
-            
-            # 阶段7：提交发布
-            logger.info(f"📋 任务 {task_id} - 阶段7: 提交发布")
-            self.task_manager.update_task(task_id, status="publishing", progress=80, message="正在提交发布...")
-            
-            try:
-                result = await client._submit_note(task.note)
-                logger.info(f"✅ 任务 {task_id} - 发布提交完成")
-                
-                if result.success:
-                    success_msg = "🎉 发布成功！"
-                    logger.info(f"任务 {task_id}: {success_msg}")
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="completed", 
-                        progress=100, 
-                        message=success_msg,
-                        result=result.to_dict()
-                    )
-                else:
-                    error_msg = f"❌ 发布失败: {result.message}"
-                    logger.error(f"任务 {task_id}: {error_msg}")
-                    self.task_manager.update_task(
-                        task_id, 
-                        status="failed", 
-                        progress=0, 
-                        message=error_msg,
-                        result=result.to_dict()
-                    )
-                
-            except Exception as e:
-                error_msg = f"❌ 提交发布失败: {str(e)}"
-                logger.error(f"任务 {task_id}: {error_msg}")
-                self.task_manager.update_task(
-                    task_id, 
-                    status="failed", 
-                    progress=0, 
-                    message=error_msg,
-                    result={
-                        "success": False,
-                        "error_type": "submit_error",
-                        "error": str(e),
-                        "suggested_action": "请检查网络连接和登录状态"
-                    }
-                )
-                return
-                
-        except Exception as e:
-            error_msg = f"任务执行失败: {str(e)}"
-            logger.error(f"❌ 任务 {task_id} 执行失败: {e}")
-            import traceback
-            logger.error(f"任务 {task_id} 错误详情: {traceback.format_exc()}")
-            self.task_manager.update_task(
-                task_id, 
-                status="failed", 
-                progress=0, 
-                message=error_msg,
-                result={"success": False, "message": error_msg}
-            )
-        finally:
-            # 清理运行任务记录
-            if task_id in self.task_manager.running_tasks:
-                del self.task_manager.running_tasks[task_id]
-            logger.info(f"🏁 任务 {task_id} 执行结束")
-
-    def _setup_resources(self) -> None:
-        """设置MCP资源"""
-        
-        @self.mcp.resource("xhs://config")
-        def get_xhs_config() -> str:
-            """获取小红书MCP服务器配置信息"""
-            config_info = self.config.to_dict()
-            config_info["server_status"] = "running"
-            return json.dumps(config_info, ensure_ascii=False, indent=2)
-        
-        @self.mcp.resource("xhs://help")
-        def get_xhs_help() -> str:
-            """获取小红书MCP服务器使用帮助"""
-            help_text = """
-# 小红书MCP服务器使用帮助
-
-## 可用工具
-
-### 1. test_connection
-- 功能: 测试MCP连接
-- 参数: 无
-
-### 2. smart_publish_note
-- 功能: 智能发布小红书笔记（支持多种输入格式）
-- 参数:
-  - title: 笔记标题
-  - content: 笔记内容
-  - images: 图片（支持本地路径、网络URL、混合数组）
-  - videos: 视频路径（目前仅支持本地文件）
-  - topics: 话题（支持字符串或数组格式）
-  - location: 位置信息
-
-### 3. check_task_status
-- 功能: 检查发布任务状态
-- 参数:
-  - task_id: 任务ID
-
-### 4. get_task_result
-- 功能: 获取已完成任务的结果
-- 参数:
-  - task_id: 任务ID
-
-### 5. login_xiaohongshu
-- 功能: 智能登录小红书
-- 参数:
-  - force_relogin: 是否强制重新登录
-  - quick_mode: 快速模式
-
-### 6. get_creator_data_analysis
-- 功能: 获取创作者数据用于分析
-- 参数: 无
-
-### 7. publish_from_json
-- 功能: 通过JSON字符串发布内容到小红书
-- 参数:
-  - json_data: JSON格式的字符串，包含发布内容
-  - title: 自定义标题（可选，不提供则从文案中提取）
-
-### 8. batch_publish_from_json
-- 功能: 批量处理JSON字符串中的多个数据条目并发布到小红书
-- 参数:
-  - json_data: JSON格式的字符串，包含多个发布条目
-  - max_items: 最大处理条目数（默认: 5）
-
-### 9. preview_json_data
-- 功能: 预览JSON数据内容，不执行发布操作
-- 参数:
-  - json_data: JSON格式的字符串
-
-## JSON数据格式
-
-### 单个条目格式:
-```json
-{
-  "fengmian": "https://example.com/cover.jpg",
-  "jiewei": "https://example.com/end.jpg",
-  "neirongtu": ["https://example.com/img1.jpg", "https://example.com/img2.jpg"],
-  "wenan": "文案内容..."
-}
-```
-
-### 批量条目格式:
-```json
-[
-  {
-    "fengmian": "https://example.com/cover1.jpg",
-    "neirongtu": ["https://example.com/img1.jpg"],
-    "wenan": "第一条文案内容..."
-  },
-  {
-    "fengmian": "https://example.com/cover2.jpg",
-    "neirongtu": ["https://example.com/img2.jpg"],
-    "wenan": "第二条文案内容..."
-  }
-]
-```
-
-## 字段说明
-
-- **fengmian**: 封面图片URL（可选）
-- **jiewei**: 结尾图片URL（可选）
-- **neirongtu**: 内容图片URL数组（可选）
-- **wenan**: 文案内容（必需）
-
-## 可用资源
-
-- xhs://config - 查看服务器配置
-- xhs://help - 查看此帮助信息
-
-## 环境变量
-
-- CHROME_PATH: Chrome浏览器路径
-- WEBDRIVER_CHROME_DRIVER: ChromeDriver路径
-- json_path: Cookies文件路径
-- ENABLE_AUTO_COLLECTION: 是否启用自动数据采集
-
-## 使用流程
+                        logger.info(f"📋 任务 {task_id} - 等待图片上传完成")
+                        self.task_manager.update_task(task_id, status="waiting_upload", progress=60, message="正在等待图片上传完成...")
+                        await asyncio.sleep(3)
+                    
+                    logger.info(f"✅ 任务 {task_id} - 文件上传完成")
+                    
+                except Exception as e:
+                    logger.warning(f"⚠️ 任务 {task_id} - 文件上传警告: {e}，继续执行...")
+            
+            # 阶段6：填写笔记内容
+            logger.info(f"📋 任务 {task_id} - 阶段6: 填写笔记内容")
+            self.task_manager.update_task(task_id, status="filling_content", progress=70, message="正在填写笔记内容...")
+            
+            try:
+                await self._client_pool.run(client, client._fill_note_content(task.note))
+                logger.info(f"✅ 任务 {task_id} - 内容填写完成")
+                
+            except Exception as e:
+                error_msg = f"❌ 填写内容失败: {str(e)}"
+                logger.error(f"任务 {task_id}: {error_msg}")
+                self.task_manager.update_task(
+                    task_id, 
+                    status="failed", 
+                    progress=0, 
+                    message=error_msg,
+                    result={
+                        "success": False,
+                        "error_type": "content_fill_error",
+                        "error": str(e),
+                        "suggested_action": "请检查内容格式"
+                    }
+                )
+                return
+            
+            # 阶段7：提交发布
+            logger.info(f"📋 任务 {task_id} - 阶段7: 提交发布")
+            self.task_manager.update_task(task_id, status="publishing", progress=80, message="正在提交发布...")
+            
+            try:
+                result = await self._client_pool.run(client, client._submit_note(task.note))
+                logger.info(f"✅ 任务 {task_id} - 发布提交完成")
+                
+                # XHSPublishResult只投影为字典一次，最终在check_task_status/get_task_result中随响应一起序列化
+                publish_result = result.to_dict()
+                
+                if result.success:
+                    success_msg = "🎉 发布成功！"
+                    logger.info(f"任务 {task_id}: {success_msg}")
+                    self.task_manager.update_task(
+                        task_id, 
+                        status="completed", 
+                        progress=100, 
+                        message=success_msg,
+                        result=publish_result
+                    )
+                else:
+                    error_msg = f"❌ 发布失败: {result.message}"
+                    logger.error(f"任务 {task_id}: {error_msg}")
+                    self.task_manager.update_task(
+                        task_id, 
+                        status="failed", 
+                        progress=0, 
+                        message=error_msg,
+                        result=publish_result
+                    )
+                
+            except Exception as e:
+                error_msg = f"❌ 提交发布失败: {str(e)}"
+                logger.error(f"任务 {task_id}: {error_msg}")
+                self.task_manager.update_task(
+                    task_id, 
+                    status="failed", 
+                    progress=0, 
+                    message=error_msg,
+                    result={
+                        "success": False,
+                        "error_type": "submit_error",
+                        "error": str(e),
+                        "suggested_action": "请检查网络连接和登录状态"
+                    }
+                )
+                return
+                
+        except Exception as e:
+            error_msg = f"任务执行失败: {str(e)}"
+            logger.exception(f"❌ 任务 {task_id} 执行失败: {e}")
+            self.task_manager.update_task(
+                task_id, 
+                status="failed", 
+                progress=0, 
+                message=error_msg,
+                result={"success": False, "message": error_msg}
+            )
+        except asyncio.CancelledError:
+            # 取消只会中断等待，工作线程中的Selenium调用仍在继续操作浏览器：
+            # 关闭该浏览器让其尽快失败退出，客户端不再归还池中，避免下个任务与残留线程争用同一浏览器
+            if client is not None:
+                cancelled_client, client = client, None
+                self._client_pool.discard(cancelled_client)
+                logger.warning(f"⚠️ 任务 {task_id} 已取消，关闭其浏览器")
+                await asyncio.to_thread(cancelled_client.browser_manager.close_driver)
+            raise
+        finally:
+            # 归还客户端，浏览器保持运行供后续任务复用
+            if client is not None:
+                self._client_pool.release(client)
+            logger.info(f"🏁 任务 {task_id} 执行结束")
 
-1. 使用 `login_xiaohongshu()` 登录小红书
-2. 使用 `preview_json_data()` 预览JSON数据内容
-3. 使用 `publish_from_json()` 或 `batch_publish_from_json()` 发布内容
-4. 使用 `check_task_status()` 查看发布进度
-5. 使用 `get_task_result()` 获取发布结果
-"""
-            return help_text
+    def _setup_resources(self) -> None:
+        """设置MCP资源"""
+        
+        @self.mcp.resource("xhs://config")
+        def get_xhs_config() -> str:
+            """获取小红书MCP服务器配置信息"""
+            return self._config_json
+        
+        @self.mcp.resource("xhs://help")
+        def get_xhs_help() -> str:
+            """获取小红书MCP服务器使用帮助"""
+            return _HELP_TEXT
     
     def _setup_prompts(self) -> None:
         """设置MCP提示词"""
@@ -1544,75 +2325,215 @@ class MCPServer:
             Returns:
                 内容创作提示词
             """
-            prompt = f"""
-请帮我创作一篇关于"{topic}"的小红书笔记，风格为"{style}"。
-
-要求：
-1. 标题要吸引人，包含emoji和关键词
-2. 内容要有价值，包含具体的建议或信息
-3. 适当使用emoji让内容更生动
-4. 添加相关标签（3-5个）
-5. 字数控制在200-500字
-6. 语言风格要贴近小红书用户习惯
-
-请按以下格式输出：
-
-【标题】
-[在这里写标题]
-
-【正文】
-[在这里写正文内容]
-
-【标签】
-[在这里列出相关标签]
-
-【发布建议】
-[发布时间、配图建议等]
-"""
-            return prompt
+            return _PROMPT_TEMPLATE.format(topic=topic, style=style)
     
-    def _setup_signal_handlers(self) -> None:
-        """设置信号处理器"""
-        def signal_handler(signum, frame):
-            logger.info("👋 收到停止信号，正在优雅关闭服务器...")
-            # 清理资源
+    def _setup_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        设置信号处理器（每个进程只注册一次）
+        
+        通过loop.add_signal_handler注册，信号到达时在事件循环中调度清理，
+        不再在信号上下文里直接退出进程
+        
+        Args:
+            loop: 正在运行的事件循环
+        """
+        if self._signal_handlers_installed:
+            return
+        
+        for sig in (signal.SIGINT, signal.SIGTERM):
             try:
-                # 停止数据采集调度器
-                if self.scheduler_initialized and data_scheduler.is_running():
-                    logger.info("🧹 停止数据采集调度器...")
-                    asyncio.run(data_scheduler.stop())
-                
-                # 清理浏览器实例
-                if hasattr(self.xhs_client, 'browser_manager') and self.xhs_client.browser_manager.is_initialized:
-                    logger.info("🧹 清理残留的浏览器实例...")
-                    self.xhs_client.browser_manager.close_driver()
-            except Exception as cleanup_error:
-                logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
+                loop.add_signal_handler(sig, self._shutdown)
+            except NotImplementedError:
+                # Windows事件循环不支持add_signal_handler，退回signal.signal并转交给事件循环处理
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self._shutdown))
+        
+        self._signal_handlers_installed = True
+    
+    def _has_open_browser(self) -> bool:
+        """主客户端或客户端池中是否有已启动的浏览器"""
+        return self.xhs_client.browser_manager.is_initialized or self._client_pool.has_open_browser()
+    
+    def _close_driver_with_deadline(self, timeout: float = _CLEANUP_DEADLINE) -> bool:
+        """
+        在守护线程中关闭主客户端和客户端池中的浏览器，最多等待timeout秒
+        
+        chromedriver无响应时close_driver可能一直挂起，守护线程不会阻止进程退出
+        
+        Args:
+            timeout: 最长等待时间（秒）
             
-            logger.info("✅ 服务器已停止")
-            os._exit(0)  # 强制退出避免ASGI错误
+        Returns:
+            bool: 是否在期限内完成关闭
+        """
+        def close_driver():
+            try:
+                self.xhs_client.browser_manager.close_driver()
+                self._client_pool.close_all()
+            except Exception as e:
+                logger.warning(f"⚠️ 关闭浏览器时出错: {e}")
+        
+        worker = threading.Thread(target=close_driver, name="xhs-close-driver", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning(f"⚠️ 浏览器在 {timeout:.0f} 秒内未能关闭，放弃等待")
+            return False
+        return True
+    
+    def _shutdown(self) -> None:
+        """收到停止信号时调度异步清理；清理期间再次收到信号时，SSE模式下立即结束服务"""
+        if self._shutdown_task is not None:
+            if self._uvicorn_server is not None and not self._uvicorn_server.force_exit:
+                logger.warning("⚠️ 再次收到停止信号，立即结束服务")
+                self._uvicorn_server.should_exit = True
+                self._uvicorn_server.force_exit = True
+            return
+        logger.info("👋 收到停止信号，正在优雅关闭服务器...")
+        self._shutdown_event.set()
+        self._shutdown_task = asyncio.get_running_loop().create_task(self._async_cleanup())
+    
+    async def _async_cleanup(self) -> None:
+        """等待进行中的发布任务结束（超时则取消）、停止调度器、关闭浏览器，然后结束服务"""
+        try:
+            # 给进行中的发布任务留出结束时间，超过期限仍未完成的再取消
+            running = list(self.task_manager.running_tasks.values())
+            if running:
+                logger.info(f"⏳ 等待 {len(running)} 个进行中的发布任务结束（最多 {_CLEANUP_DEADLINE:.0f} 秒）...")
+                _, pending = await asyncio.wait(running, timeout=_CLEANUP_DEADLINE)
+                if pending:
+                    logger.info(f"🧹 取消 {len(pending)} 个未完成的发布任务...")
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+            
+            await self._stop_background_services()
+        except Exception as cleanup_error:
+            logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
+        
+        # 结束服务：SSE模式通知uvicorn退出，让其先发送完进行中的响应；stdio模式直接结束服务任务。
+        # 通过handle_exit而非直接设置should_exit：MCP的SSE传输基于sse-starlette，它挂接在handle_exit上
+        # 通知所有EventSourceResponse结束推送，长连接随即关闭，无需等到优雅退出超时
+        if self._uvicorn_server is not None:
+            self._uvicorn_server.handle_exit(signal.SIGTERM, None)
+        elif self._serve_task is not None:
+            self._serve_task.cancel()
+    
+    async def _stop_background_services(self) -> None:
+        """停止数据采集调度器并关闭浏览器（已停止的部分会被跳过，可重复调用）"""
+        # 两者互不依赖，并发执行，关闭耗时取两者中较长的一个
+        steps = []
+        
+        # 停止数据采集调度器
+        if self.scheduler_initialized and data_scheduler.is_running():
+            logger.info("🧹 停止数据采集调度器...")
+            steps.append(data_scheduler.stop())
+        
+        # 清理浏览器实例（Selenium调用是阻塞的，放到线程中执行并限定等待时间）
+        if self._has_open_browser():
+            logger.info("🧹 清理残留的浏览器实例...")
+            steps.append(asyncio.to_thread(self._close_driver_with_deadline))
+        
+        for result in await asyncio.gather(*steps, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ 清理资源时出错: {result}")
+    
+    async def _start_data_collection(self, cookie_count: int) -> None:
+        """初始化数据采集功能（无头模式），失败时只记录日志，不影响服务启动"""
+        logger.info("📊 初始化数据采集功能（无头模式）...")
+        try:
+            await self._initialize_data_collection(cookie_count)
+            if self.scheduler_initialized:
+                logger.info("✅ 数据采集功能初始化完成（无头模式）")
+            else:
+                logger.info("ℹ️ 数据采集功能未启用或初始化失败")
+        except Exception as e:
+            logger.warning(f"⚠️ 数据采集功能初始化失败: {e}")
+    
+    def _build_sse_app(self, cookie_count: int):
+        """
+        获取FastMCP的SSE ASGI应用（兼容新旧版本FastMCP的接口），并挂载服务生命周期
+        
+        在FastMCP原有的lifespan之内，启动时初始化数据采集，关闭时停止调度器和浏览器，
+        两者都运行在处理请求的事件循环中，uvicorn正常退出（包括收到SIGTERM）时都会执行关闭流程
+        
+        Args:
+            cookie_count: 启动前统计的cookie数量，用于决定是否初始化数据采集
+        """
+        http_app = getattr(self.mcp, "http_app", None)
+        app = http_app(transport="sse") if http_app is not None else self.mcp.sse_app()
+        inner_lifespan = app.router.lifespan_context
+        
+        @asynccontextmanager
+        async def lifespan(app):
+            async with inner_lifespan(app) as state:
+                await self._start_data_collection(cookie_count)
+                try:
+                    yield state
+                finally:
+                    try:
+                        await self._stop_background_services()
+                    except Exception as cleanup_error:
+                        logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
+        
+        app.router.lifespan_context = lifespan
+        return app
+    
+    async def _serve(self, sock: socket.socket, cookie_count: int) -> None:
+        """
+        在当前事件循环中注册信号处理器并运行SSE服务
         
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        Args:
+            sock: 预先绑定的监听套接字
+            cookie_count: 启动前统计的cookie数量
+        """
+        self._serve_task = asyncio.current_task()
+        self._setup_signal_handlers(asyncio.get_running_loop())
+        
+        # SSE连接是长连接，退出时最多等待_CLEANUP_DEADLINE秒让进行中的响应发送完毕；
+        # 服务只供本机或局域网内的MCP客户端直连，关闭访问日志、代理头解析和默认响应头
+        self._uvicorn_server = _SSEServer(uvicorn.Config(
+            self._build_sse_app(cookie_count),
+            log_level="warning",
+            access_log=False,
+            proxy_headers=False,
+            server_header=False,
+            date_header=False,
+            timeout_graceful_shutdown=int(_CLEANUP_DEADLINE)
+        ))
+        try:
+            await self._uvicorn_server.serve(sockets=[sock])
+            logger.info("🔌 SSE服务已停止")
+        except asyncio.CancelledError:
+            logger.info("🔌 SSE服务已停止")
     
     def start_stdio(self) -> None:
         """启动stdio模式的MCP服务器（用于Claude Desktop）"""
-        # 设置日志只输出到stderr，避免干扰stdio通信
-        import sys
-        from ..utils.logger import setup_logger, get_logger
-        
-        # 重新配置日志，只输出到stderr
-        import logging
+        # 设置日志只输出到stderr，避免干扰stdio通信；
+        # 标准库日志先进入队列，由QueueListener的后台线程格式化并写入stderr，记录日志时不阻塞事件循环
         root_logger = logging.getLogger()
         root_logger.handlers = []
         
         stderr_handler = logging.StreamHandler(sys.stderr)
         stderr_handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)-8s | %(message)s'))
-        root_logger.addHandler(stderr_handler)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
         root_logger.setLevel(getattr(logging, self.config.log_level.upper()))
+        log_listener = logging.handlers.QueueListener(log_queue, stderr_handler)
+        log_listener.start()
         
+        try:
+            self._run_stdio()
+        finally:
+            # 停止监听线程，写出队列中剩余的日志
+            log_listener.stop()
+    
+    def _run_stdio(self) -> None:
+        """验证配置并运行stdio服务（日志已由start_stdio配置）"""
         logger.info("🚀 启动MCP服务器（stdio模式）...")
         
+        # stdio服务同样运行在asyncio.run创建的事件循环中，可选启用uvloop
+        _install_uvloop()
+        
         # 验证配置
         validation = self.config.validate_config()
         if not validation["valid"]:
@@ -1624,19 +2545,16 @@ class MCPServer:
         logger.info("✅ 配置验证通过")
         
         # 工具已在__init__中注册
-        logger.info(f"🎯 MCP工具列表:")
-        for tool in ["test_connection", "smart_publish_note", "check_task_status", 
-                    "get_task_result", "login_xiaohongshu", "get_creator_data_analysis", "publish_from_result_file", "batch_publish_from_result_files", "preview_result_file"]:
-            logger.info(f"   • {tool}")
+        logger.info(_TOOLS_BANNER)
         
-        # 初始化数据采集（如果启用）
+        # 初始化数据采集（如果启用），在运行stdio服务的事件循环中执行
+        collection_cookie_count = None
         try:
-            cookies = self.xhs_client.cookie_manager.load_cookies()
-            if cookies and os.getenv('ENABLE_AUTO_COLLECTION', 'false').lower() == 'true':
-                logger.info("📊 初始化数据采集功能...")
+            cookie_count = self.xhs_client.cookie_manager.count_cookies()
+            if cookie_count and _auto_collection_enabled():
                 # stdio模式下使用无头浏览器
                 self.xhs_client.browser_manager.headless = True
-                self.scheduler_initialized = self._initialize_data_collection()
+                collection_cookie_count = cookie_count
             else:
                 logger.info("ℹ️ 数据采集功能未启用")
         except Exception as e:
@@ -1644,18 +2562,71 @@ class MCPServer:
         
         # 使用stdio transport
         logger.info("🎯 MCP工具已注册，等待客户端连接...")
-        self.mcp.run(transport="stdio")
+        asyncio.run(self._serve_stdio(collection_cookie_count))
     
-    def start(self) -> None:
-        """启动MCP服务器"""
-        logger.info("🚀 启动小红书 MCP 服务器...")
+    def _install_thread_pool(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        为事件循环设置默认线程池，asyncio.to_thread的阻塞调用都在其中执行
         
-        # 设置日志级别
-        setup_logger(self.config.log_level)
+        每个进行中的发布任务会占用一个线程执行Selenium步骤，默认线程池（min(32, CPU核数+4)）
+        在CPU核数较少时可能被发布任务占满，导致其他工具的文件读取、cookies检查等排队等待，
+        因此至少为每个池内客户端预留两个线程，另留出余量给其他阻塞调用
         
-        # 验证配置
+        Args:
+            loop: 正在运行的事件循环
+        """
+        default_workers = min(32, (os.cpu_count() or 1) + 4)
+        max_workers = max(default_workers, self._client_pool.size * 2 + 4)
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="xhs-worker"))
+        logger.debug(f"🧵 工作线程池大小: {max_workers}")
+    
+    async def _serve_stdio(self, collection_cookie_count: Optional[int] = None) -> None:
+        """
+        在当前事件循环中注册信号处理器并运行stdio服务
+        
+        Args:
+            collection_cookie_count: 需要初始化数据采集时传入已统计的cookie数量，否则为None
+        """
+        loop = asyncio.get_running_loop()
+        self._install_thread_pool(loop)
+        _enable_slow_callback_warnings(loop)
+        self._serve_task = asyncio.current_task()
+        self._setup_signal_handlers(loop)
+        
+        if collection_cookie_count:
+            await self._initialize_data_collection(collection_cookie_count)
+        
+        try:
+            await self.mcp.run_stdio_async()
+        except asyncio.CancelledError:
+            logger.info("🔌 stdio服务已停止")
+    
+    async def _prepare(self) -> Tuple[Dict[str, Any], int, Optional[str]]:
+        """
+        并发执行启动前的准备工作：验证配置、统计cookies、探测本机IP
+        
+        Returns:
+            Tuple[Dict[str, Any], int, Optional[str]]: (配置验证结果, cookie数量, 本机IP)
+        """
+        return await asyncio.gather(
+            asyncio.to_thread(self.config.validate_config),
+            asyncio.to_thread(self.xhs_client.cookie_manager.count_cookies),
+            asyncio.to_thread(_get_local_ip)
+        )
+    
+    async def _start_async(self) -> None:
+        """
+        在同一个事件循环中完成启动准备、数据采集初始化、SSE服务运行和退出清理
+        
+        数据采集调度器（AsyncIOScheduler）绑定在启动它的事件循环上，必须与SSE服务共用同一个循环
+        """
+        loop = asyncio.get_running_loop()
+        self._install_thread_pool(loop)
+        _enable_slow_callback_warnings(loop)
+        
+        # 验证配置，同时统计cookies并探测本机IP（三者互不依赖，并发执行）
         logger.info("🔍 验证配置...")
-        validation = self.config.validate_config()
+        validation, cookie_count, local_ip = await self._prepare()
         
         if not validation["valid"]:
             logger.error("❌ 配置验证失败:")
@@ -1666,79 +2637,67 @@ class MCPServer:
         
         logger.info("✅ 配置验证通过")
         
-        # 设置信号处理
-        self._setup_signal_handlers()
-        
-        # 获取本机IP地址
+        # 校验监听地址并预先绑定端口
         try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("10.254.254.254", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
+            sock = _bind_listener(self.config.server_host, self.config.server_port)
+        except (ValueError, OSError) as e:
+            logger.error(f"❌ 无法监听 {self.config.server_host}:{self.config.server_port}: {e}")
+            logger.error("💡 请检查 .env 中的 SERVER_HOST / SERVER_PORT 配置")
+            return
+        
+        bound_ip = sock.getsockname()[0]
+        if bound_ip != self.config.server_host:
+            logger.info(f"📡 监听地址 {self.config.server_host} 已解析为 {bound_ip}")
+        
+        if local_ip:
             logger.info(f"📡 本机IP地址: {local_ip}")
-        except Exception:
-            local_ip = "未知"
-            
-        logger.info(f"🚀 启动SSE服务器 (端口{self.config.server_port})")
-        logger.info("📡 可通过以下地址访问:")
-        logger.info(f"   • http://localhost:{self.config.server_port}/sse (本机)")
-        if local_ip != "未知":
-            logger.info(f"   • http://{local_ip}:{self.config.server_port}/sse (内网)")
-        
-        logger.info("🎯 MCP工具列表:")
-        logger.info("   • test_connection - 测试MCP连接")
-        logger.info("   • smart_publish_note - 发布小红书笔记（支持智能路径解析）")
-        logger.info("   • check_task_status - 检查发布任务状态")
-        logger.info("   • get_task_result - 获取已完成任务的结果")
-        logger.info("   • login_xiaohongshu - 智能登录小红书")
-        logger.info("   • get_creator_data_analysis - 获取创作者数据用于分析")
-        logger.info("   • publish_from_json - 通过JSON字符串发布内容到小红书")
-        logger.info("   • batch_publish_from_json - 批量处理JSON字符串中的多个数据条目并发布到小红书")
-        logger.info("   • preview_json_data - 预览JSON数据内容，不执行发布操作")
-        
-        logger.info("🔧 按 Ctrl+C 停止服务器")
-        logger.info("💡 终止时的ASGI错误信息是正常现象，可以忽略")
-        
-        # 初始化数据采集功能（无头模式）
-        logger.info("📊 初始化数据采集功能（无头模式）...")
-        try:
-            asyncio.run(self._initialize_data_collection())
-            if self.scheduler_initialized:
-                logger.info("✅ 数据采集功能初始化完成（无头模式）")
-            else:
-                logger.info("ℹ️ 数据采集功能未启用或初始化失败")
-        except Exception as e:
-            logger.warning(f"⚠️ 数据采集功能初始化失败: {e}")
+            
+        # 访问地址、工具列表和提示合并为一条日志输出
+        banner = [
+            f"🚀 启动SSE服务器 (端口{self.config.server_port})",
+            "📡 可通过以下地址访问:",
+            f"   • http://localhost:{self.config.server_port}/sse (本机)"
+        ]
+        if local_ip:
+            banner.append(f"   • http://{local_ip}:{self.config.server_port}/sse (内网)")
+        banner.append(_TOOLS_BANNER)
+        banner.append("🔧 按 Ctrl+C 停止服务器")
+        logger.info("\n".join(banner))
         
         try:
-            # 使用FastMCP内置的run方法，禁用uvicorn的日志以避免干扰MCP通信
-            import logging
-            logging.getLogger("uvicorn").setLevel(logging.WARNING)
-            logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-            
-            self.mcp.run(transport="sse", port=self.config.server_port, host=self.config.server_host)
-            
-        except KeyboardInterrupt:
-            logger.info("👋 收到停止信号，正在关闭服务器...")
-        except Exception as e:
-            logger.error(f"❌ 服务器启动失败: {e}")
-            raise
+            # 数据采集在SSE应用的lifespan中初始化和停止；信号处理器在_serve中注册到当前事件循环
+            with sock:
+                await self._serve(sock, cookie_count)
         finally:
-            # 清理资源
+            # 服务被强制中断时lifespan的关闭流程不会执行，这里兜底清理（已清理的部分会被跳过）
             try:
-                # 停止数据采集调度器
-                if self.scheduler_initialized and data_scheduler.is_running():
-                    logger.info("🧹 停止数据采集调度器...")
-                    asyncio.run(data_scheduler.stop())
-                
-                # 清理浏览器实例
-                if hasattr(self.xhs_client, 'browser_manager') and self.xhs_client.browser_manager.is_initialized:
-                    logger.info("🧹 清理残留的浏览器实例...")
-                    self.xhs_client.browser_manager.close_driver()
+                await self._stop_background_services()
             except Exception as cleanup_error:
                 logger.warning(f"⚠️ 清理资源时出错: {cleanup_error}")
             
             logger.info("✅ 服务器已停止")
+    
+    def start(self) -> None:
+        """启动MCP服务器"""
+        logger.info("🚀 启动小红书 MCP 服务器...")
+        
+        # 安装uvloop事件循环策略（可选依赖），需在创建任何事件循环之前完成
+        _install_uvloop()
+        
+        # 设置日志级别
+        setup_logger(self.config.log_level)
+        
+        # 由uvicorn直接运行FastMCP的SSE应用，禁用uvicorn的日志以避免干扰MCP通信
+        logging.getLogger("uvicorn").setLevel(logging.WARNING)
+        
+        try:
+            asyncio.run(self._start_async())
+        except KeyboardInterrupt:
+            # 信号处理器在服务启动时才注册，启动准备阶段按下Ctrl+C仍会走到这里
+            logger.info("👋 收到停止信号，正在关闭服务器...")
+        except Exception as e:
+            logger.error(f"❌ 服务器启动失败: {e}")
+            raise
 
 
 # 便捷函数
@@ -1757,9 +2716,6 @@ def create_mcp_server(config: XHSConfig) -> MCPServer:
 
 def main():
     """主函数入口"""
-    import sys
-    from ..core.config import XHSConfig
-    
     config = XHSConfig()
     server = MCPServer(config)
     
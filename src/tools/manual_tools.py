@@ -8,8 +8,8 @@
 
 import os
 import json
+import asyncio
 import time
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -23,6 +23,18 @@ from src.utils.text_utils import safe_print
 
 logger = get_logger(__name__)
 
+# pandas 仅在导出和分析数据时使用，延迟导入以免拖慢命令行和服务器启动
+_pd = None
+
+
+def _get_pd():
+    """获取延迟导入的pandas模块"""
+    global _pd
+    if _pd is None:
+        import pandas
+        _pd = pandas
+    return _pd
+
 
 class ManualTools:
     """手动操作工具类"""
@@ -102,8 +114,8 @@ class ManualTools:
             for name, collect_func in collectors:
                 safe_print(f"\n📈 收集{name}数据...")
                 try:
-                    # 这里的collect_func已经包含了dimension参数
-                    data = collect_func(None)  # 数据收集函数会自己处理维度
+                    # 这里的collect_func已经包含了dimension参数；采集函数是协程，命令行中直接运行
+                    data = asyncio.run(collect_func(None))  # 数据收集函数会自己处理维度
                     if data:
                         safe_print(f"  ✅ {name}数据收集成功")
                         success_count += 1
@@ -239,6 +251,7 @@ class ManualTools:
             
             # 时间戳
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            pd = _get_pd()
             
             if format == "excel":
                 # 创建Excel文件
@@ -313,6 +326,8 @@ class ManualTools:
         safe_print("📈 分析数据趋势")
         
         try:
+            pd = _get_pd()
+            
             # 读取数据
             data_dir = Path(self.config.data_path) / "creator_db"
             
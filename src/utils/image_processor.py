@@ -28,13 +28,15 @@ logger = get_logger(__name__)
 class ImageProcessor:
     """图片处理器，支持本地文件、网络URL及浏览器下载"""
     
-    def __init__(self, temp_dir: Optional[str] = None, cookies: Optional[List] = None):
+    def __init__(self, temp_dir: Optional[str] = None, cookies: Optional[List] = None,
+                 max_concurrent_downloads: int = 1):
         """
         初始化图片处理器
         
         Args:
             temp_dir: 临时文件目录路径
             cookies: 浏览器cookies，用于下载需要登录的图片
+            max_concurrent_downloads: 同时下载的网络图片数上限，默认1即按顺序下载，调用方确认图床可承受时再调大
         """
         # 设置临时目录
         if temp_dir:
@@ -48,6 +50,7 @@ class ImageProcessor:
         
         # 保存cookies用于下载
         self.cookies = cookies or []
+        self.max_concurrent_downloads = max(1, max_concurrent_downloads)
         
         logger.info(f"图片处理器初始化，临时目录: {self.temp_dir}, Cookies数量: {len(self.cookies)}")
     
@@ -81,11 +84,20 @@ class ImageProcessor:
         
         logger.info(f"📸 开始处理图片，总数: {len(images_list)} 张，严格模式: {strict_mode}")
 
-        # 改为顺序下载，避免因URL时效性或服务器并发限制导致失败
-        processed_results: List[Union[str, None]] = []
-        for i, img in enumerate(images_list):
-            result = await self._process_single_image(img, i)
-            processed_results.append(result)
+        # 网络图片默认按顺序下载：每次下载都会启动一个浏览器，且图床可能限制并发，
+        # 用信号量限制同时下载的数量（可由调用方调大）；本地文件不受限制。结果顺序与输入一致
+        semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+        
+        async def process(img, index: int) -> Optional[str]:
+            if isinstance(img, str) and img.startswith(('http://', 'https://')):
+                async with semaphore:
+                    return await self._process_single_image(img, index)
+            return await self._process_single_image(img, index)
+        
+        processed_results: List[Union[str, None, BaseException]] = await asyncio.gather(
+            *(process(img, i) for i, img in enumerate(images_list)),
+            return_exceptions=True
+        )
 
         successful_downloads: List[str] = []
         failed_images: List[Tuple[int, str]] = []
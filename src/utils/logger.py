@@ -34,13 +34,17 @@ class LoggerConfig:
         # 移除默认的日志处理器
         logger.remove()
         
+        # 各处理器均使用enqueue=True：日志消息先放入队列，由后台线程写入stderr和文件，
+        # 在事件循环中记录日志时不会因磁盘或终端I/O而阻塞
+        
         # 添加控制台输出
         if self.log_to_console:
             logger.add(
                 sys.stderr,
                 level=self.log_level,
                 format="<green>{time:HH:mm:ss}</green> | <level>{level:<8}</level> | <level>{message}</level>",
-                colorize=True
+                colorize=True,
+                enqueue=True
             )
         
         # 添加文件输出
@@ -51,7 +55,8 @@ class LoggerConfig:
                 retention="7 days",
                 level=self.log_level,
                 format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level:<8} | {name}:{function}:{line} - {message}",
-                encoding="utf-8"
+                encoding="utf-8",
+                enqueue=True
             )
         
         # 如果是DEBUG级别，输出详细信息
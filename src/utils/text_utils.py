@@ -7,6 +7,9 @@
 import re
 from typing import List, Optional
 
+# 逗号分隔列表的分隔符（连同两侧空白一起切分，切分结果无需再逐项strip）
+_SEP_RE = re.compile(r"\s*,\s*")
+
 
 def clean_text_for_browser(text: str) -> str:
     """
@@ -179,18 +182,8 @@ def parse_topics_string(topics_string: str) -> List[str]:
     if not topics_string:
         return []
     
-    # 分割并清理话题
-    topics = [topic.strip() for topic in topics_string.split(",") if topic.strip()]
-    
-    # 移除重复话题（保持顺序）
-    unique_topics = []
-    seen = set()
-    for topic in topics:
-        if topic not in seen:
-            unique_topics.append(topic)
-            seen.add(topic)
-    
-    return unique_topics
+    # 一次切分得到清理后的话题，并移除重复话题（保持顺序）
+    return list(dict.fromkeys(topic for topic in _SEP_RE.split(topics_string.strip()) if topic))
 
 
 # 为了向后兼容，保留原函数名
@@ -220,10 +213,8 @@ def parse_file_paths_string(paths_string: str) -> List[str]:
     if not paths_string:
         return []
     
-    # 分割并清理路径
-    paths = [path.strip() for path in paths_string.split(",") if path.strip()]
-    
-    return paths
+    # 一次切分得到清理后的路径
+    return [path for path in _SEP_RE.split(paths_string.strip()) if path]
 
 
 def smart_parse_file_paths(paths_input) -> List[str]:
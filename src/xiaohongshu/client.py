@@ -728,7 +728,7 @@ class XHSClient:
             try:
                 # 采集账号概览数据
                 logger.info("🏠 开始采集账号概览数据...")
-                dashboard_data = collect_dashboard_data(driver, date)
+                dashboard_data = await collect_dashboard_data(driver, date)
                 result["data"]["dashboard"] = dashboard_data
                 
                 # 等待间隔，遵守采集规范
@@ -736,7 +736,7 @@ class XHSClient:
                 
                 # 采集内容分析数据
                 logger.info("📊 开始采集内容分析数据...")
-                content_data = collect_content_analysis_data(driver, date)
+                content_data = await collect_content_analysis_data(driver, date)
                 result["data"]["content_analysis"] = content_data
                 
                 # 等待间隔
@@ -744,7 +744,7 @@ class XHSClient:
                 
                 # 采集粉丝数据
                 logger.info("👥 开始采集粉丝数据...")
-                fans_data = collect_fans_data(driver, date)
+                fans_data = await collect_fans_data(driver, date)
                 result["data"]["fans"] = fans_data
                 
                 logger.info("✅ 创作者数据采集完成")
@@ -9,7 +9,7 @@
 
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Iterator
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
@@ -143,7 +143,7 @@ async def collect_content_analysis_data(driver: WebDriver, date: Optional[str] =
                 # 格式化数据用于存储
                 formatted_notes = _format_notes_for_storage(enhanced_notes_data)
                 storage_manager = get_storage_manager()
-                storage_manager.save_content_analysis_data(formatted_notes)
+                await storage_manager.async_save_content_analysis_data(formatted_notes)
                 logger.info("💾 内容分析数据已保存到存储")
             except Exception as e:
                 logger.error(f"❌ 保存内容分析数据时出错: {e}")
@@ -542,10 +542,8 @@ def _return_to_list_page(driver: WebDriver) -> None:
         logger.warning(f"⚠️ 返回列表页面失败: {e}")
 
 
-def _format_notes_for_storage(notes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """格式化笔记数据用于存储"""
-    formatted_notes = []
-    
+def _format_notes_for_storage(notes_data: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """格式化笔记数据用于存储（逐条产出，直接流入存储层）"""
     for note in notes_data:
         try:
             # 提取基础字段
@@ -588,13 +586,11 @@ def _format_notes_for_storage(notes_data: List[Dict[str, Any]]) -> List[Dict[str
                 "interest_top3": note.get("interest_top3", "")
             }
             
-            formatted_notes.append(formatted_note)
+            yield formatted_note
             
         except Exception as e:
             logger.warning(f"⚠️ 格式化笔记数据时出错: {e}")
             continue
-    
-    return formatted_notes
 
 
 def _generate_summary(notes_data: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -6,6 +6,7 @@
 """
 
 import time
+import asyncio
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -20,7 +21,7 @@ from src.data.storage_manager import get_storage_manager
 
 logger = get_logger(__name__)
 
-def collect_dashboard_data(driver, save_data=True):
+async def collect_dashboard_data(driver, save_data=True):
     """
     采集仪表板数据，包括笔记总览数据
     支持7天和30天两个维度
@@ -28,50 +29,13 @@ def collect_dashboard_data(driver, save_data=True):
     logger.info("开始采集仪表板数据...")
     
     try:
-        # 导航到仪表板页面
-        driver.get("https://creator.xiaohongshu.com/new/home")
-        wait_for_page_load(driver)
-        
-        # 等待数据加载
-        wait_for_dashboard_data(driver)
-        
-        # 采集多维度数据
-        all_data = []
-        
-        # 采集7天数据
-        logger.info("开始采集7天维度数据...")
-        seven_day_data = _collect_dimension_data(driver, "7天")
-        if seven_day_data:
-            all_data.append(seven_day_data)
-            logger.info(f"✅ 7天数据采集成功: 观看{seven_day_data.get('views', 0)}, 点赞{seven_day_data.get('likes', 0)}")
-        else:
-            logger.error("❌ 7天数据采集失败")
-        
-        # 切换到30天维度并采集数据
-        logger.info("开始切换到30天维度...")
-        if _switch_to_30day_dimension(driver):
-            logger.info("30天维度切换成功，开始采集30天数据...")
-            thirty_day_data = _collect_dimension_data(driver, "30天")
-            if thirty_day_data:
-                all_data.append(thirty_day_data)
-                logger.info(f"✅ 30天数据采集成功: 观看{thirty_day_data.get('views', 0)}, 点赞{thirty_day_data.get('likes', 0)}")
-                
-                # 比较7天和30天数据
-                if seven_day_data and thirty_day_data:
-                    if (seven_day_data.get('views') == thirty_day_data.get('views') and 
-                        seven_day_data.get('likes') == thirty_day_data.get('likes')):
-                        logger.info("ℹ️ 7天和30天数据相同，这可能是正常的（账号最近才活跃）")
-                    else:
-                        logger.info("ℹ️ 7天和30天数据不同，数据采集正常")
-            else:
-                logger.error("❌ 30天数据采集失败")
-        else:
-            logger.error("❌ 30天维度切换失败，只保存7天数据")
+        # Selenium操作是阻塞的，放到线程中执行，避免阻塞事件循环
+        all_data = await asyncio.to_thread(_collect_all_dimensions, driver)
         
         # 保存数据
         if save_data and all_data:
             storage_manager = get_storage_manager()
-            storage_manager.save_dashboard_data(all_data)
+            await storage_manager.async_save_dashboard_data(all_data)
             logger.info(f"✅ 仪表板数据保存成功，共保存 {len(all_data)} 个维度的数据")
         
         return {
@@ -88,6 +52,50 @@ def collect_dashboard_data(driver, save_data=True):
             "data": []
         }
 
+def _collect_all_dimensions(driver):
+    """打开仪表板页面并依次采集7天和30天维度的数据"""
+    # 导航到仪表板页面
+    driver.get("https://creator.xiaohongshu.com/new/home")
+    wait_for_page_load(driver)
+    
+    # 等待数据加载
+    wait_for_dashboard_data(driver)
+    
+    # 采集多维度数据
+    all_data = []
+    
+    # 采集7天数据
+    logger.info("开始采集7天维度数据...")
+    seven_day_data = _collect_dimension_data(driver, "7天")
+    if seven_day_data:
+        all_data.append(seven_day_data)
+        logger.info(f"✅ 7天数据采集成功: 观看{seven_day_data.get('views', 0)}, 点赞{seven_day_data.get('likes', 0)}")
+    else:
+        logger.error("❌ 7天数据采集失败")
+    
+    # 切换到30天维度并采集数据
+    logger.info("开始切换到30天维度...")
+    if _switch_to_30day_dimension(driver):
+        logger.info("30天维度切换成功，开始采集30天数据...")
+        thirty_day_data = _collect_dimension_data(driver, "30天")
+        if thirty_day_data:
+            all_data.append(thirty_day_data)
+            logger.info(f"✅ 30天数据采集成功: 观看{thirty_day_data.get('views', 0)}, 点赞{thirty_day_data.get('likes', 0)}")
+            
+            # 比较7天和30天数据
+            if seven_day_data and thirty_day_data:
+                if (seven_day_data.get('views') == thirty_day_data.get('views') and 
+                    seven_day_data.get('likes') == thirty_day_data.get('likes')):
+                    logger.info("ℹ️ 7天和30天数据相同，这可能是正常的（账号最近才活跃）")
+                else:
+                    logger.info("ℹ️ 7天和30天数据不同，数据采集正常")
+        else:
+            logger.error("❌ 30天数据采集失败")
+    else:
+        logger.error("❌ 30天维度切换失败，只保存7天数据")
+    
+    return all_data
+
 def _collect_dimension_data(driver, dimension):
     """采集指定维度的数据"""
     logger.info(f"采集{dimension}维度数据...")
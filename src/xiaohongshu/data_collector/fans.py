@@ -11,6 +11,7 @@
 """
 
 import time
+import asyncio
 from typing import Dict, List, Any, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -25,7 +26,7 @@ from src.data.storage_manager import get_storage_manager
 
 logger = get_logger(__name__)
 
-def collect_fans_data(driver: WebDriver, save_data: bool = True) -> Dict[str, Any]:
+async def collect_fans_data(driver: WebDriver, save_data: bool = True) -> Dict[str, Any]:
     """采集粉丝数据，支持7天和30天两个维度"""
     fans_data = {
         "success": False,
@@ -37,16 +38,8 @@ def collect_fans_data(driver: WebDriver, save_data: bool = True) -> Dict[str, An
     try:
         logger.info("👥 开始采集粉丝数据...")
         
-        # 访问粉丝数据页面
-        fans_url = "https://creator.xiaohongshu.com/creator/fans"
-        logger.info(f"📍 访问粉丝数据页面: {fans_url}")
-        driver.get(fans_url)
-        
-        # 等待页面加载
-        wait_for_fans_data(driver)
-        
-        # 采集两个维度的粉丝数据
-        fans_data["data"] = _collect_multi_dimension_fans_data(driver)
+        # Selenium操作是阻塞的，放到线程中执行，避免阻塞事件循环
+        fans_data["data"] = await asyncio.to_thread(_open_and_collect_fans_data, driver)
         
         if fans_data["data"]:
             fans_data["success"] = True
@@ -69,7 +62,7 @@ def collect_fans_data(driver: WebDriver, save_data: bool = True) -> Dict[str, An
                     })
                 
                 if storage_data:
-                    storage_manager.save_fans_data(storage_data)
+                    await storage_manager.async_save_fans_data(storage_data)
                     logger.info("💾 粉丝数据已保存到存储")
                     
                     for item in storage_data:
@@ -86,6 +79,17 @@ def collect_fans_data(driver: WebDriver, save_data: bool = True) -> Dict[str, An
     
     return fans_data
 
+def _open_and_collect_fans_data(driver: WebDriver) -> List[Dict[str, Any]]:
+    """访问粉丝数据页面并采集两个维度的粉丝数据"""
+    fans_url = "https://creator.xiaohongshu.com/creator/fans"
+    logger.info(f"📍 访问粉丝数据页面: {fans_url}")
+    driver.get(fans_url)
+    
+    # 等待页面加载
+    wait_for_fans_data(driver)
+    
+    return _collect_multi_dimension_fans_data(driver)
+
 def _collect_multi_dimension_fans_data(driver: WebDriver) -> List[Dict[str, Any]]:
     """采集多维度粉丝数据"""
     all_fans_data = []
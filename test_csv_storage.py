@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+测试CSV存储的按日期覆盖保存
+
+验证笔记标题包含换行时原样保存，且同一天再次保存仍然替换而不是追加今日数据
+"""
+
+import csv
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.storage.csv_storage import CSVStorage
+
+
+def _read_titles(storage: CSVStorage) -> list:
+    """读取内容分析文件中的全部笔记标题"""
+    with open(storage.content_analysis_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        title_idx = storage.content_analysis_fields.index('title')
+        return [row[title_idx] for row in reader if row]
+
+
+def test_multiline_title_overwrite():
+    """测试多行标题的今日数据覆盖"""
+    print("🧪 测试多行标题的今日数据覆盖...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        storage = CSVStorage({'data_dir': data_dir, 'flush_interval': 0})
+
+        storage.save_content_analysis_data([{'title': 'l1\nl2'}])
+        assert _read_titles(storage) == ['l1\nl2'], "标题中的换行应原样保存"
+
+        storage.save_content_analysis_data([{'title': 'z'}])
+        titles = _read_titles(storage)
+        assert titles == ['z'], f"同一天再次保存应替换今日数据，实际: {titles}"
+
+    print("✅ 多行标题覆盖保存正常")
+
+
+def test_legacy_multiline_row_overwrite():
+    """测试旧文件中已存在带换行的今日记录时的覆盖"""
+    print("🧪 测试旧文件中的多行记录...")
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        storage = CSVStorage({'data_dir': data_dir, 'flush_interval': 0})
+
+        # 模拟旧版本直接用csv.writer写入的多行字段
+        row = [''] * len(storage.content_analysis_fields)
+        row[0] = row[1] = f"{storage._get_today_date()}T08:00:00"
+        row[storage.content_analysis_fields.index('title')] = 'l1\nl2'
+        with open(storage.content_analysis_file, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f, lineterminator='\n').writerow(row)
+
+        storage.save_content_analysis_data([{'title': 'z'}])
+        titles = _read_titles(storage)
+        assert titles == ['z'], f"旧的今日多行记录应被替换，实际: {titles}"
+
+    print("✅ 旧文件多行记录覆盖保存正常")
+
+
+if __name__ == "__main__":
+    test_multiline_title_overwrite()
+    test_legacy_multiline_row_overwrite()
+    print("\n🎉 CSV存储测试完成！")